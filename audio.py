@@ -0,0 +1,144 @@
+"""Practice tracks: scale runs and chords synthesized to 16-bit mono WAV.
+
+Notes are additive sine partials under a short attack and release envelope. Every
+note length is rendered once per pitch and kept in a cache, so a track is a
+sequence of cached tables, and chords are sums of them. Tracks are produced
+note by note and written as they are produced, so even long tracks never sit in
+memory whole. Run ``python -m audio --help`` to render the catalog.
+"""
+import argparse
+import os
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from keys import SCALE_NAMES, SCALES, TABLE, chord_voicings, scale_run, tonic_slug
+
+SAMPLE_RATE = 44100
+# Relative amplitudes of the fundamental and its overtones.
+PARTIALS = (1.0, 0.5, 0.25, 0.125, 0.0625)
+# Frequency of pitch class 0 ('A') in the octave the tracks start in.
+BASE_FREQUENCY = 220.0
+NOTE_SECONDS = 0.4
+CHORD_SECONDS = 1.2
+FADE_SECONDS = 0.01
+# Peak level of a single note, leaving headroom for four-note chords.
+LEVEL = 0.22 * 32767
+
+
+def frequency(semitone: float) -> float:
+    """Return the frequency in Hz of the note `semitone` semitones above the base 'A'."""
+    return BASE_FREQUENCY * 2.0 ** (semitone / 12)
+
+
+@lru_cache(maxsize=512)
+def tone(semitone: float, frames: int, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Return `frames` float32 samples of the note `semitone` semitones above the base 'A'.
+
+    The array is shared by every caller and read-only.
+    """
+    t = np.arange(frames, dtype=np.float64) / sample_rate
+    harmonics = np.arange(1, len(PARTIALS) + 1)
+    samples = np.sin(np.outer(t, 2 * np.pi * frequency(semitone) * harmonics)) @ np.array(PARTIALS)
+    fade = min(int(FADE_SECONDS * sample_rate), frames // 2)
+    envelope = np.ones(frames)
+    if fade:
+        ramp = np.linspace(0.0, 1.0, fade, endpoint=False)
+        envelope[:fade] = ramp
+        envelope[frames - fade:] = ramp[::-1]
+    table = (samples * envelope * (LEVEL / sum(PARTIALS))).astype(np.float32)
+    table.flags.writeable = False
+    return table
+
+
+def block(semitones, seconds: float, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Return the 16-bit little-endian frames of `semitones` sounding together for `seconds`."""
+    frames = int(seconds * sample_rate)
+    mixed = np.zeros(frames, dtype=np.float32)
+    for semitone in semitones:
+        mixed += tone(semitone, frames, sample_rate)
+    return np.clip(mixed, -32768, 32767).astype('<i2').tobytes()
+
+
+def practice_track(tonic: str, scale_name: str, repeats: int = 1, sample_rate: int = SAMPLE_RATE):
+    """Yield the frames of a practice track: the scale up and down, then its chords, `repeats` times."""
+    run = scale_run(tonic, scale_name)
+    chords = chord_voicings(tonic, scale_name)
+    for _ in range(repeats):
+        for semitone in run:
+            yield block((semitone,), NOTE_SECONDS, sample_rate)
+        for chord in chords:
+            yield block(chord, CHORD_SECONDS, sample_rate)
+
+
+def write_wav(path, blocks, sample_rate: int = SAMPLE_RATE) -> int:
+    """Write the 16-bit mono frames of `blocks` to a WAV file at `path` as they are produced.
+
+    Returns the number of frames written.
+    """
+    frames = 0
+    with wave.open(path, 'wb') as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(sample_rate)
+        for data in blocks:
+            file.writeframesraw(data)
+            frames += len(data) // 2
+    return frames
+
+
+def track_name(tonic: str, scale_name: str) -> str:
+    """Return the file name of the practice track of a scale."""
+    return f'{tonic_slug(tonic)}-{SCALES[scale_name.lower()].name}.wav'
+
+
+def render_job(job) -> int:
+    """Write the practice track of an (out_dir, tonic, scale name, repeats) job, returning its frames."""
+    out_dir, tonic, scale_name, repeats = job
+    return write_wav(os.path.join(out_dir, track_name(tonic, scale_name)),
+                     practice_track(tonic, scale_name, repeats))
+
+
+def export(out_dir, tonics=TABLE.tonics, scale_names=SCALE_NAMES, repeats=1, workers=None, chunksize=8):
+    """Render the practice track of every (tonic, scale) to `out_dir` in a process pool.
+
+    Each worker writes its own files, so no audio crosses process boundaries. Returns the
+    number of tracks and frames written and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    job_list = [(out_dir, tonic, scale_name, repeats) for tonic in tonics for scale_name in scale_names]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        frames = sum(executor.map(render_job, job_list, chunksize=chunksize))
+    return len(job_list), frames, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m audio', description='Render practice tracks as WAV.')
+    parser.add_argument('out_dir', help='directory to write the tracks to')
+    parser.add_argument('-t', '--tonic', action='append', dest='tonics', metavar='TONIC',
+                        help='tonic to render, may be repeated (default: all)')
+    parser.add_argument('-s', '--scale', action='append', dest='scales', metavar='SCALE',
+                        help='scale to render, may be repeated (default: all)')
+    parser.add_argument('-r', '--repeats', type=int, default=1, help='times to play each track (default: 1)')
+    parser.add_argument('-w', '--workers', type=int, help='number of worker processes (default: one per core)')
+    args = parser.parse_args(argv)
+
+    for scale_name in args.scales or ():
+        if scale_name.lower() not in SCALES:
+            parser.error(f"unknown scale '{scale_name}', choose from {', '.join(SCALE_NAMES)}")
+    for tonic in args.tonics or ():
+        if tonic not in TABLE.tonics:
+            parser.error(f"invalid tonic '{tonic}'")
+
+    tracks, frames, seconds = export(args.out_dir, args.tonics or TABLE.tonics, args.scales or SCALE_NAMES,
+                                     args.repeats, args.workers)
+    print(f'{tracks} tracks, {frames / SAMPLE_RATE / 60:.1f} min of audio in {seconds:.2f} s '
+          f'({frames / SAMPLE_RATE / seconds:,.0f}x real time, {args.workers or os.cpu_count()} workers)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,665 @@
+"""Benchmarks for the Scale Generator hot paths.
+
+Run every benchmark with ``python benchmarks.py`` or pick some by name,
+e.g. ``python benchmarks.py click``. ``--save FILE`` stores the timings as
+JSON, and ``python benchmarks.py compare BASELINE CURRENT`` lists the timings
+that got slower than the baseline by more than a threshold.
+"""
+import argparse
+import json
+import math
+import platform
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+import catalog
+import examples
+import identify
+import keys
+import songdb
+from fretboard import Fretboard
+from keys import Scale, TABLE, TONICS
+
+# Timings in seconds by benchmark name and label, filled in by `record`.
+RESULTS = {}
+_current = {}
+THRESHOLD = 0.10
+
+
+def measure(func, number, repeat=5):
+    """Return the best per-call time of `func` in seconds."""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def record(label, seconds):
+    """Keep `seconds` under `label` in the results of the running benchmark."""
+    _current[label] = seconds
+
+
+def _format(label, value):
+    # Sizes and counts are recorded as they are, timings in seconds.
+    if label.endswith(('(bytes)', '(blocks)')):
+        return f'{value:12,.0f}   '
+    return f'{value * 1e6:12.2f} us'
+
+
+def report(label, seconds):
+    record(label, seconds)
+    print(f'{label:<45} {_format(label, seconds)}')
+
+
+def _scales_text(key, results):
+    return '\n\n'.join(f'{key} {name} Scale: {" ".join(scale)}\n{name} Chords: {chords}'
+                       for name, (scale, chords) in results.items()) + '\n'
+
+
+def bench_click(number=200):
+    """Per-click latency of the key and scale buttons, recomputed vs table lookup."""
+    def key_click_recomputed():
+        for key in TONICS:
+            _scales_text(key, Scale(key)._compute_all())
+
+    def key_click_lookup():
+        for key in TONICS:
+            _scales_text(key, TABLE.scales(key))
+
+    def scale_click_recomputed():
+        for key in TONICS:
+            getattr(Scale(key), 'ousak')()
+
+    def scale_click_lookup():
+        for key in TONICS:
+            TABLE.get(key, 'Ousak')
+
+    for label, func in [('key click (recomputed)', key_click_recomputed),
+                        ('key click (table lookup)', key_click_lookup),
+                        ('scale click (recomputed)', scale_click_recomputed),
+                        ('scale click (table lookup)', scale_click_lookup)]:
+        report(label, measure(func, number) / len(TONICS))
+
+
+def bench_scales(number=20_000):
+    """Every scale method, `scale_all()`, the chord strings and the key click text, uncached."""
+    import sheets
+
+    scale = Scale('D')
+    for name in keys.SCALE_NAMES:
+        report(f'{name.lower()}()', measure(getattr(scale, name.lower()), number))
+    report('scale_all()', measure(scale.scale_all, number // 10))
+    report('_compute_all()', measure(scale._compute_all, number // 10))
+    definition = keys.SCALES['xitzaz']
+    notes, _ = scale.xitzaz()
+    report('chord string', measure(lambda: definition.chord_format.format(*notes), number))
+    report('scales_text() (uncached)', measure(lambda: sheets.scales_text.__wrapped__('D'), number // 10))
+
+
+def synthetic_scales(count, seed=0):
+    """Return a registry of `count` made-up seven-note scales, loaded like user-defined ones."""
+    rng = random.Random(seed)
+    entries = []
+    while len(entries) < count:
+        intervals = ''.join(rng.choices('mMA', weights=(3, 4, 1), k=7))
+        if sum(Scale.INTERVALS[interval] for interval in intervals) == 12:
+            entries.append({'name': f'Synthetic {len(entries)}', 'intervals': intervals, 'chords': [[1, '']]})
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'scales.json')
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(entries, file)
+        return keys.load_scales(path)
+
+
+def bench_patterns(count=10_000, number=200):
+    """Interval fragment search over synthetic scales: scanning every pattern vs the n-gram index."""
+    import patterns
+
+    scales = synthetic_scales(count)
+    start = time.perf_counter()
+    index = patterns.PatternIndex(scales)
+    print(f'{count:,} scales')
+    report('build index', time.perf_counter() - start)
+
+    def scan(fragment):
+        found = []
+        for definition in scales.values():
+            cycle = definition.intervals * 2
+            for position in range(len(definition.intervals)):
+                if cycle.startswith(fragment, position):
+                    found.append((definition.name, position + 1))
+        return found
+
+    for fragment in ('mAm', 'MMmM', 'mAmMmMM'):
+        print(f"'{fragment}': {len(index.find(fragment)):,} matches")
+        report(f"'{fragment}' (scan)", measure(lambda: scan(fragment), number // 20, repeat=3))
+        report(f"'{fragment}' (index)", measure(lambda: index.find(fragment), number, repeat=3))
+
+
+def _allocated(func, number):
+    # Return the memory blocks and bytes still allocated per call after `number` calls of `func`.
+    import tracemalloc
+
+    kept = [None] * number
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for i in range(number):
+            kept[i] = func()
+        differences = tracemalloc.take_snapshot().compare_to(before, 'filename')
+    finally:
+        tracemalloc.stop()
+    return (sum(stat.count_diff for stat in differences) / number,
+            sum(stat.size_diff for stat in differences) / number)
+
+
+def bench_memory(number=10_000):
+    """Memory of the full catalog and allocations per call, lists and strings vs `ScaleResult`."""
+    import gc
+
+    tonics = TABLE.tonics
+    scale = Scale('D')
+    for label, func, calls in [('ousak()', scale.ousak, number),
+                               ("result('ousak')", lambda: scale.result('ousak'), number),
+                               ('scale_all()', scale.scale_all, number // 20),
+                               ('results()', scale.results, number // 20)]:
+        blocks, size = _allocated(func, calls)
+        report(f'{label} per call (blocks)', blocks)
+        report(f'{label} per call (bytes)', size)
+
+    # The first compact catalog also builds the index arrays that later ones share.
+    keys._pitch_indices.cache_clear()
+    gc.collect()
+    for label, build in [('legacy', lambda: {tonic: Scale(tonic)._compute_all() for tonic in tonics}),
+                         ('compact', lambda: {tonic: Scale(tonic).results() for tonic in tonics}),
+                         ('compact, shared', lambda: {tonic: Scale(tonic).results() for tonic in tonics})]:
+        _, size = _allocated(build, 1)
+        report(f'catalog, {label} (bytes)', size)
+    report('catalog lists and strings', measure(lambda: [Scale(tonic)._compute_all() for tonic in tonics], 20))
+    report('catalog views of ScaleResult',
+           measure(lambda: [[tuple(result) for result in Scale(tonic).results().values()] for tonic in tonics], 20))
+
+
+def bench_spelling(number=20_000):
+    """Letter-per-degree spelling: computed vs table lookup, and a fretboard spelled from it."""
+    import spelling
+
+    board = Fretboard()
+    pitches = spelling.pitch_names('D', 'Xitzaz', board.pitches)
+    mask = Scale('D').mask('Xitzaz')
+    for label, func in [("spell_pattern() (computed)", lambda: spelling.spell_pattern.__wrapped__('mAmMmMM', 'D')),
+                        ("spelled('D', 'Xitzaz')", lambda: spelling.spelled('D', 'Xitzaz')),
+                        ('xitzaz() (sharp/flat table)', Scale('D').xitzaz),
+                        ('render (board spelling)', lambda: board.render(mask)),
+                        ('render (scale spelling)', lambda: board.render(mask, pitches))]:
+        report(label, measure(func, number))
+
+
+def _legacy_construct(tonic):
+    # What `Scale.__init__` did before the frozenset and dict lookups.
+    if tonic not in Scale.SHARP_TONES + Scale.FLAT_TONES:
+        raise ValueError(tonic)
+    pitches = Scale.SHARP_PITCHES if tonic in Scale.SHARP_TONES else Scale.FLAT_PITCHES
+    return pitches.index(tonic.capitalize())
+
+
+def bench_construction(number=100_000):
+    """`Scale` construction, `for_tonic()`, `chromatic()` and `interval()`."""
+    scale = Scale('f#')
+    for label, func in [('construction (list scans)', lambda: _legacy_construct('f#')),
+                        ('Scale(tonic)', lambda: Scale('f#')),
+                        ('Scale.for_tonic(tonic)', lambda: Scale.for_tonic('f#')),
+                        ('chromatic()', scale.chromatic),
+                        ("interval('MMmMMMm')", lambda: scale.interval('MMmMMMm'))]:
+        report(label, measure(func, number))
+
+
+def bench_edo(number=20_000):
+    """Scale methods on a 12-EDO grid vs the quarter-tone walk of finer resolutions."""
+    for edo in (12, 24, 53):
+        scale = Scale('D', edo)
+        for name in ('rast', 'xouzam'):
+            report(f'{edo}-EDO {name}()', measure(getattr(scale, name), number))
+    report('Scale(tonic, 53)', measure(lambda: Scale('f#', 53), number))
+
+
+def bench_masks(number=100_000):
+    """Pitch-class mask operations vs the equivalent note-name list scans."""
+    scale, _ = TABLE.get('D', 'Xitzaz')
+    other, _ = TABLE.get('A', 'Minor')
+    notes = ['D', 'Eb', 'F#', 'G', 'A']
+    scale_mask, other_mask = keys.mask_of(scale), keys.mask_of(other)
+    notes_mask = keys.mask_of(notes)
+
+    for label, func in [('membership (list scan)', lambda: all(note in scale for note in notes)),
+                        ('membership (mask)', lambda: notes_mask & ~scale_mask == 0),
+                        ('intersection (list scan)', lambda: [note for note in scale if note in other]),
+                        ('intersection (mask)', lambda: scale_mask & other_mask),
+                        ('transpose (Scale)', lambda: Scale('E').xitzaz()),
+                        ('transpose (mask)', lambda: keys.transpose(scale_mask, 2))]:
+        seconds = measure(func, number)
+        record(label, seconds)
+        print(f'{label:<45} {seconds * 1e6:12.3f} us {1 / seconds:14,.0f} ops/s')
+
+
+def _identify_queries(count, seed=0):
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        scale, _ = TABLE.get(rng.choice(TONICS), rng.choice(keys.SCALE_NAMES))
+        queries.append(rng.sample(scale[:-1], rng.randint(3, 6)))
+    return queries
+
+
+def bench_identify(count=2000):
+    """Reverse lookup throughput: scanning every Scale method vs the inverted index."""
+    queries = _identify_queries(count)
+
+    def scan(notes):
+        found = []
+        for tonic in TONICS:
+            scale_instance = Scale(tonic)
+            for name in keys.SCALE_NAMES:
+                scale, _ = scale_instance.scale(name)
+                if all(note in scale for note in notes):
+                    found.append((tonic, name))
+        return found
+
+    def timed(func):
+        latencies = []
+        start = time.perf_counter()
+        for notes in queries:
+            t = time.perf_counter()
+            func(notes)
+            latencies.append(time.perf_counter() - t)
+        total = time.perf_counter() - start
+        latencies.sort()
+        return count / total, latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+
+    index = identify.ScaleIndex()
+    cold = timed(index.identify)
+    for label, (throughput, p50, p99) in [('scan every Scale method', timed(scan)),
+                                          ('inverted index (cold)', cold),
+                                          ('inverted index (warm)', timed(index.identify))]:
+        record(f'{label} per query', 1 / throughput)
+        record(f'{label} p50', p50)
+        record(f'{label} p99', p99)
+        print(f'{label:<30} {throughput:12,.0f} queries/s  p50 {p50 * 1e6:9.2f} us  p99 {p99 * 1e6:9.2f} us')
+
+
+def _regex_fretboard(scale):
+    # The per-note regex rewrite `ScaleApp.display_scale` used before `Fretboard`.
+    all_notes = ['A', 'A#', 'Bb', 'B', 'C', 'C#', 'Db', 'D', 'D#', 'Eb', 'E', 'F', 'F#', 'Gb', 'G', 'G#', 'Ab']
+    modified_fretboard = examples.fretboard
+    for note in all_notes:
+        if note not in scale:
+            blank = '-' if len(note) == 1 else '- '
+            modified_fretboard = re.sub(fr'(?:(?<=\s)|(?<=^)){re.escape(note)}(?:(?=\s)|(?=\n)|(?=$))', blank,
+                                        modified_fretboard)
+    return modified_fretboard
+
+
+def bench_fretboard(number=2000):
+    """Blanking the notes outside a scale: regex rewrite vs the NumPy fretboard."""
+    scale, _ = TABLE.get('D', 'Xitzaz')
+    mask = keys.mask_of(scale)
+    default = Fretboard()
+    large = Fretboard(('B', 'E', 'A', 'D', 'G', 'B', 'E', 'A'), frets=36)
+    for label, func in [('regex rewrite (3 strings, 24 frets)', lambda: _regex_fretboard(scale)),
+                        ('NumPy render (3 strings, 24 frets)', lambda: default.render(mask)),
+                        ('NumPy render (8 strings, 36 frets)', lambda: large.render(mask))]:
+        report(label, measure(func, number))
+
+
+def bench_startup(runs=20):
+    """Wall-clock startup of the headless CLI, next to a bare interpreter."""
+    def best(args):
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL,
+                           cwd=os.path.dirname(os.path.abspath(__file__)))
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    bare = best(['-c', 'pass'])
+    cli = best(['-m', 'cli', '--tonic', 'D', '--scale', 'Ousak'])
+    report('python -c pass', bare)
+    report('python -m cli --tonic D --scale Ousak', cli)
+    report('CLI startup over the bare interpreter', cli - bare)
+
+
+def bench_snapshot(runs=10):
+    """Cold start to the first scale view: live rendering with NumPy vs a prebuilt snapshot."""
+    import snapshot
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'scales.snap')
+        start = time.perf_counter()
+        size = snapshot.build(path)
+        print(f'snapshot of {size / 1e6:.1f} MB')
+        report('build snapshot', time.perf_counter() - start)
+        for label, views in (('live views', repr(os.path.join(tmp, 'missing.snap'))), ('snapshot', repr(path))):
+            script = ('import time; start = time.perf_counter(); import catalog, snapshot; '
+                      f'views = snapshot.views({views}); views.scales_text("D"); '
+                      'views.scale_view("D", "Xitzaz", "bouzouki3", catalog.CATALOG); '
+                      'print(time.perf_counter() - start)')
+            times = [float(subprocess.run([sys.executable, '-c', script], check=True, capture_output=True, text=True,
+                                          cwd=os.path.dirname(os.path.abspath(__file__))).stdout)
+                     for _ in range(runs)]
+            report(f'import to first view ({label})', min(times))
+
+
+def synthetic_songs(count, seed=0):
+    """Return `count` made-up `catalog.Song` objects built from the real titles' words."""
+    rng = random.Random(seed)
+    words = sorted({word for song in catalog.CATALOG.songs for word in catalog.tokens(song.title)})
+    scale_keys = list(keys.SCALES)
+    return [catalog.Song(' '.join(rng.choices(words, k=rng.randint(2, 6))).capitalize(),
+                         tuple(rng.sample(scale_keys, rng.randint(1, 3))),
+                         rng.choice(TONICS)) for _ in range(count)]
+
+
+def bench_catalog(count=50_000, number=200):
+    """Song catalog indexing, prefix search and fuzzy search on a synthetic repertoire."""
+    songs = synthetic_songs(count)
+    start = time.perf_counter()
+    song_catalog = catalog.SongCatalog(songs=songs)
+    song_catalog.search('')
+    print(f'{count:,} songs')
+    report('build indexes', time.perf_counter() - start)
+    for label, func in [('by_scale()', lambda: song_catalog.by_scale('xitzaz')),
+                        ("search('o mer')", lambda: song_catalog.search('o mer', limit=20)),
+                        ("search('ta', scale='ousak', tonic='D')",
+                         lambda: song_catalog.search('ta', scale='ousak', tonic='D', limit=20)),
+                        ("fuzzy('rembetes tu dounia')", lambda: song_catalog.fuzzy('rembetes tu dounia'))]:
+        report(label, measure(func, number, repeat=3))
+
+
+_LOADERS = {
+    'dict literal module': 'import songs_literal; titles = songs_literal.tragoudia["ousak"]',
+    'JSON catalog': 'import catalog; titles = catalog.SongCatalog({json!r}).by_scale("ousak")',
+    'SQLite database': 'import songdb; titles = songdb.SongDatabase({db!r}).by_scale("ousak")',
+}
+
+
+def bench_songdb(count=100_000):
+    """Cold-process load of one scale's songs: dict literal import vs JSON catalog vs SQLite."""
+    songs = synthetic_songs(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = [{'title': song.title, 'scales': list(song.scales), 'tonic': song.tonic} for song in songs]
+        json_path, db_path = os.path.join(tmp, 'songs.json'), os.path.join(tmp, 'songs.db')
+        with open(json_path, 'w', encoding='utf-8') as file:
+            json.dump(entries, file)
+        songdb.build(entries, db_path)
+        tragoudia = {}
+        for song in songs:
+            for scale in song.scales:
+                tragoudia.setdefault(scale, []).append(song.title)
+        with open(os.path.join(tmp, 'songs_literal.py'), 'w', encoding='utf-8') as file:
+            file.write(f'tragoudia = {tragoudia!r}\n')
+
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([os.path.dirname(os.path.abspath(__file__)), tmp]))
+        for label, statement in _LOADERS.items():
+            # Peak RSS comes from /proc: ru_maxrss would include this parent process at fork time.
+            script = ('import time; start = time.perf_counter(); '
+                      + statement.format(json=json_path, db=db_path)
+                      + '; elapsed = time.perf_counter() - start; '
+                        'peak = [line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")]; '
+                        'print(elapsed, peak[0], len(titles))')
+            # The first run compiles the literal module to a .pyc, as an installed app would have.
+            subprocess.run([sys.executable, '-c', script], env=env, check=True, capture_output=True)
+            runs = [subprocess.run([sys.executable, '-c', script], env=env, check=True,
+                                   capture_output=True, text=True).stdout.split() for _ in range(3)]
+            seconds, peak_rss, titles = min(runs, key=lambda run: float(run[0]))
+            record(label, float(seconds))
+            print(f'{label:<25} {float(seconds) * 1e3:9.1f} ms  peak RSS {int(peak_rss) / 1024:7.1f} MB'
+                  f'  ({titles} titles, {count:,} songs)')
+
+
+def bench_audio(number=20):
+    """Practice track synthesis: cold vs cached waveform tables, and a streamed WAV write."""
+    import audio
+
+    def render():
+        return sum(len(data) for data in audio.practice_track('D', 'Xitzaz'))
+
+    seconds = audio.NOTE_SECONDS * 15 + audio.CHORD_SECONDS * len(keys.chord_voicings('D', 'Xitzaz'))
+    audio.tone.cache_clear()
+    start = time.perf_counter()
+    render()
+    report('practice track (cold tables)', time.perf_counter() - start)
+    cached = measure(render, number, repeat=3)
+    report('practice track (cached tables)', cached)
+    print(f'{"":<45} {seconds / cached:12,.0f}x real time')
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'track.wav')
+        report('practice track to WAV (streamed)',
+               measure(lambda: audio.write_wav(path, audio.practice_track('D', 'Xitzaz')), number, repeat=3))
+
+
+def bench_detect():
+    """Dromos detection on synthetic practice tracks: speed on one core and catalog accuracy."""
+    import audio
+    import detect
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'track.wav')
+        audio.write_wav(path, audio.practice_track('D', 'Xitzaz', repeats=10))
+        start = time.perf_counter()
+        tracker = None
+        for tracker in detect.listen(path):
+            pass
+        seconds = time.perf_counter() - start
+    report('detect a WAV file', seconds)
+    print(f'{"":<45} {tracker.seconds / seconds:12,.0f}x real time ({tracker.seconds:.0f} s of audio)')
+
+    found = total = 0
+    for tonic in TONICS:
+        for definition in keys.SCALES.values():
+            tracker = detect.PitchClassTracker(audio.SAMPLE_RATE)
+            for data in audio.practice_track(tonic, definition.name):
+                tracker.feed(data)
+            best = tracker.best()
+            # Scales sharing the notes of the answer sound the same to a pitch-class histogram.
+            found += best.tonic == tonic and keys.SCALES[best.scale.lower()].mask == definition.mask
+            total += 1
+    print(f'{"tonic and notes found":<45} {found:8} / {total}')
+
+
+def bench_midi(count=20_000):
+    """Streaming MIDI analysis of a multi-megabyte file built from `count` scale runs."""
+    import midi
+
+    events = []
+    tick = 0
+    for i in range(count):
+        for semitone in keys.scale_run(TONICS[i % len(TONICS)], keys.SCALE_NAMES[i % len(keys.SCALE_NAMES)]):
+            note = midi.BASE_NOTE + semitone
+            events.append((tick, 0x90, bytes((note, midi.VELOCITY))))
+            tick += midi.TICKS_PER_BEAT
+            events.append((tick, 0x80, bytes((note, 0))))
+    data = midi.smf(events)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'song.mid')
+        with open(path, 'wb') as file:
+            file.write(data)
+        seconds = measure(lambda: midi.analyze(path), 1, repeat=3)
+    report('analyze a MIDI file', seconds)
+    print(f'{"":<45} {len(events) / seconds:12,.0f} events/s {len(data) / seconds / 1e6:8.1f} MB/s'
+          f' ({len(data) / 1e6:.1f} MB)')
+
+
+def bench_harmony(number=20):
+    """Progressions of the whole catalog: cold caches vs the shared degree tables."""
+    import harmony
+
+    def cold():
+        harmony.degree_table.cache_clear()
+        harmony._ranked.cache_clear()
+        harmony._on_root.cache_clear()
+        return harmony.all_progressions(TONICS, seventh=True)
+
+    print(f'{len(TONICS) * len(keys.SCALES)} scales')
+    report('catalog progressions, recomputed', measure(cold, number, repeat=3))
+    report('catalog progressions, table lookup', measure(lambda: harmony.all_progressions(TONICS, seventh=True),
+                                                         number, repeat=3))
+    report("progressions('D', 'Xitzaz')", measure(lambda: harmony.progressions('D', 'Xitzaz'), number * 100))
+
+
+async def _load(port, paths, connections, requests):
+    # Each connection sends `requests` keep-alive GETs in turn and times every response.
+    import asyncio
+
+    async def client(offset):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        latencies = []
+        for i in range(requests):
+            path = paths[(offset + i) % len(paths)]
+            start = time.perf_counter()
+            writer.write(f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode())
+            head = await reader.readuntil(b'\r\n\r\n')
+            length = int(re.search(rb'Content-Length: (\d+)', head).group(1))
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+        writer.close()
+        return latencies
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(i * requests) for i in range(connections)))
+    return time.perf_counter() - start, sorted(latency for latencies in results for latency in latencies)
+
+
+def bench_service(connections=32, requests=300):
+    """Load test of the HTTP service: throughput and latency percentiles over keep-alive connections."""
+    import asyncio
+    import socket
+
+    from profiling import percentile
+
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        port = probe.getsockname()[1]
+    server = subprocess.Popen([sys.executable, '-m', 'service', '--port', str(port)], stdout=subprocess.DEVNULL,
+                              cwd=os.path.dirname(os.path.abspath(__file__)))
+    try:
+        for _ in range(100):
+            try:
+                socket.create_connection(('127.0.0.1', port)).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        paths = [f'/{route}/{tonic.replace("#", "%23")}/{name}{suffix}'
+                 for tonic in TABLE.tonics for name in keys.SCALE_NAMES
+                 for route, suffix in (('scales', ''), ('chords', ''), ('fretboard', '/bouzouki3'))]
+        # The first pass requests every path once and fills the response cache.
+        for label, count in (('cold', -(-len(paths) // connections)), ('cached', requests)):
+            seconds, latencies = asyncio.run(_load(port, paths, connections, count))
+            print(f'{label}: {len(latencies):,} requests over {connections} connections, '
+                  f'{len(latencies) / seconds:,.0f} requests/s')
+            for fraction in (0.5, 0.9, 0.99):
+                report(f'latency p{fraction * 100:g} ({label})', percentile(latencies, fraction))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+BENCHMARKS = {
+    'click': bench_click,
+    'scales': bench_scales,
+    'construction': bench_construction,
+    'edo': bench_edo,
+    'spelling': bench_spelling,
+    'masks': bench_masks,
+    'patterns': bench_patterns,
+    'memory': bench_memory,
+    'identify': bench_identify,
+    'fretboard': bench_fretboard,
+    'startup': bench_startup,
+    'snapshot': bench_snapshot,
+    'catalog': bench_catalog,
+    'songdb': bench_songdb,
+    'audio': bench_audio,
+    'detect': bench_detect,
+    'midi': bench_midi,
+    'harmony': bench_harmony,
+    'service': bench_service,
+}
+
+
+def run(names, save=None):
+    global _current
+    for name in names or BENCHMARKS:
+        print(f'== {name}')
+        _current = RESULTS[name] = {}
+        BENCHMARKS[name]()
+    if save:
+        with open(save, 'w', encoding='utf-8') as file:
+            json.dump({'python': platform.python_version(), 'machine': platform.machine(),
+                       'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'results': RESULTS}, file, indent=2)
+        print(f'wrote {save}')
+
+
+def compare(baseline, current, threshold=THRESHOLD):
+    """Print the timings of two saved runs side by side and return the labels that regressed.
+
+    A timing regressed when it is more than `threshold` (a fraction) slower than the baseline.
+    """
+    with open(baseline, encoding='utf-8') as file:
+        before = json.load(file)['results']
+    with open(current, encoding='utf-8') as file:
+        after = json.load(file)['results']
+
+    regressions = []
+    for name, timings in after.items():
+        print(f'== {name}')
+        for label, seconds in timings.items():
+            old = before.get(name, {}).get(label)
+            if old is None:
+                print(f'{label:<45} {_format(label, seconds)}  (new)')
+                continue
+            if old:
+                change = seconds / old - 1
+            else:
+                # Nothing to scale by: a timing or count that appears from zero regressed.
+                change = math.inf if seconds else 0.0
+            flag = ''
+            if change > threshold:
+                flag = '  REGRESSION'
+                regressions.append(f'{name}: {label}')
+            elif change < -threshold:
+                flag = '  faster'
+            print(f'{label:<45} {_format(label, old)} {_format(label, seconds)} {change:+8.1%}{flag}')
+    print(f'{len(regressions)} regression(s) over {threshold:.0%}')
+    return regressions
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ['compare']:
+        parser = argparse.ArgumentParser(prog='python benchmarks.py compare',
+                                         description='Compare two saved benchmark runs.')
+        parser.add_argument('baseline', help='JSON file of the run to compare against')
+        parser.add_argument('current', help='JSON file of the new run')
+        parser.add_argument('-t', '--threshold', type=float, default=THRESHOLD * 100,
+                            help=f'percent slowdown that counts as a regression (default: {THRESHOLD:.0%})')
+        args = parser.parse_args(argv[1:])
+        return 1 if compare(args.baseline, args.current, args.threshold / 100) else 0
+
+    parser = argparse.ArgumentParser(prog='python benchmarks.py', description='Run the benchmarks.')
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help=f'benchmark to run, may be repeated (default: all of {", ".join(BENCHMARKS)})')
+    parser.add_argument('-s', '--save', metavar='FILE', help='write the timings to FILE as JSON')
+    args = parser.parse_args(argv)
+    for name in args.names:
+        if name not in BENCHMARKS:
+            parser.error(f"unknown benchmark '{name}', choose from {', '.join(BENCHMARKS)}")
+    run(args.names, args.save)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
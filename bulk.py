@@ -0,0 +1,66 @@
+"""Bulk export of scale sheets for every (tonic, scale, instrument) to a directory.
+
+Jobs are rendered by a process pool and written in job order, so the output is the
+same whatever the number of workers. Run ``python -m bulk --help`` for the options.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from keys import SCALE_NAMES, TABLE, tonic_slug
+from instruments import INSTRUMENTS
+
+ALL_TONICS = TABLE.tonics
+
+
+def jobs(tonics=ALL_TONICS, scale_names=SCALE_NAMES, instruments=tuple(INSTRUMENTS)):
+    """Return the (tonic, scale name, instrument) jobs in export order."""
+    return [(tonic, scale_name, instrument)
+            for instrument in instruments for tonic in tonics for scale_name in scale_names]
+
+
+def render_job(job) -> tuple[str, str]:
+    """Return the relative path and text of the scale sheet for a (tonic, scale, instrument) job."""
+    import instruments
+    from sheets import scale_sheet
+
+    tonic, scale_name, instrument = job
+    path = os.path.join(instrument, f'{tonic_slug(tonic)}-{scale_name}.txt')
+    return path, scale_sheet(tonic, scale_name, instruments.fretboard(instrument)) + '\n'
+
+
+def export(out_dir, job_list, workers=None, chunksize=32):
+    """Render `job_list` in a process pool and write the sheets under `out_dir` in job order.
+
+    Returns the number of files and bytes written and the elapsed seconds.
+    """
+    start = time.perf_counter()
+    files = written = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for path, text in executor.map(render_job, job_list, chunksize=chunksize):
+            target = os.path.join(out_dir, path)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, 'w', encoding='utf-8') as file:
+                written += file.write(text)
+            files += 1
+    return files, written, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m bulk', description='Export scale sheets for every tonic.')
+    parser.add_argument('out_dir', help='directory to write the sheets to')
+    parser.add_argument('-i', '--instrument', action='append', dest='instruments', choices=INSTRUMENTS,
+                        help='instrument to export, may be repeated (default: all)')
+    parser.add_argument('-w', '--workers', type=int, help='number of worker processes (default: one per core)')
+    parser.add_argument('--chunksize', type=int, default=32, help='jobs sent to a worker at a time (default: 32)')
+    args = parser.parse_args(argv)
+
+    job_list = jobs(instruments=args.instruments or tuple(INSTRUMENTS))
+    files, written, seconds = export(args.out_dir, job_list, args.workers, args.chunksize)
+    print(f'{files} sheets, {written / 1e6:.1f} MB in {seconds:.2f} s '
+          f'({files / seconds:,.0f} sheets/s, {args.workers or os.cpu_count()} workers)')
+
+
+if __name__ == '__main__':
+    main()
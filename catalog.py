@@ -0,0 +1,206 @@
+"""Song catalog: the repertoire indexed by title words, scale and tonic.
+
+The songs live in songs.json, one entry per song with its title, the scales
+(dromoi) it is played in and optionally its tonic and its 'order', the song's place
+among the songs of each of its scales. The file is only read on the first lookup,
+so importing this module costs nothing.
+"""
+import bisect
+import json
+import os
+import re
+from collections import Counter, defaultdict, namedtuple
+
+from profiling import timed
+
+SONGS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'songs.json')
+
+# Older data used 'xitzazkiar' for the scale registered as 'Xitzaskiar'.
+SCALE_ALIASES = {'xitzazkiar': 'xitzaskiar'}
+
+_WORD = re.compile(r'\w+')
+
+
+class Song(namedtuple('Song', 'title scales tonic')):
+    """A song with its `title`, the lowercase `scales` it is played in and its `tonic` or None."""
+    __slots__ = ()
+
+
+def normalize_scale(scale: str) -> str:
+    """Return the registry key of `scale`, resolving old spellings in `SCALE_ALIASES`."""
+    scale = scale.lower()
+    return SCALE_ALIASES.get(scale, scale)
+
+
+def songs_text(scale_name: str, titles) -> str:
+    """Return the songs pane text for `scale_name`, with '-' when there are no `titles`."""
+    return f'Songs for {scale_name} scale:\n\n' + '\n'.join(titles or ['-'])
+
+
+def tokens(text: str) -> list[str]:
+    """Return the lowercase words of `text`."""
+    return _WORD.findall(text.lower())
+
+
+def trigrams(word: str) -> set[str]:
+    """Return the character trigrams of `word`, padded so short words still have some."""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SongCatalog:
+    """The repertoire with inverted indexes from words, scales and tonics to songs.
+
+    Parameters:
+    ----------
+    path:
+        The JSON file to load on first use, defaults to `SONGS_FILE`.
+    songs:
+        An iterable of `Song` objects to use instead of a file.
+
+    Functions:
+    ---------
+    by_scale(scale: str) -> list[str]:
+        Return the titles played in `scale`, in their order for that scale.
+    scales_of(title: str) -> tuple[str, ...]:
+        Return the scales of the song called `title`.
+    search(query: str, scale: str, tonic: str, limit: int) -> list[Song]:
+        Return the songs whose title words start with every word of `query`.
+    fuzzy(query: str, limit: int, cutoff: float) -> list[Song]:
+        Return the songs whose title words are closest to `query`, tolerating typos.
+    """
+
+    def __init__(self, path=SONGS_FILE, songs=None):
+        self.path = path
+        self._songs = None if songs is None else list(songs)
+        # (scale, song id): the song's place among the songs of that scale, from songs.json.
+        self._places = {}
+        self._loaded = False
+
+    @property
+    def songs(self) -> list[Song]:
+        """Every song in catalog order."""
+        self._load()
+        return self._songs
+
+    def _load(self):
+        if self._loaded:
+            return
+        if self._songs is None:
+            with open(self.path, encoding='utf-8') as file:
+                entries = json.load(file)
+            self._songs = []
+            for i, entry in enumerate(entries):
+                scales = tuple(normalize_scale(scale) for scale in entry['scales'])
+                self._songs.append(Song(entry['title'], scales, entry.get('tonic')))
+                for scale, place in zip(scales, entry.get('order', ())):
+                    self._places[scale, i] = place
+
+        self._by_title = {}
+        self._by_scale = defaultdict(list)
+        self._by_tonic = defaultdict(list)
+        by_word = defaultdict(set)
+        for i, song in enumerate(self._songs):
+            self._by_title.setdefault(song.title.lower(), i)
+            for scale in song.scales:
+                self._by_scale[scale].append(i)
+            if song.tonic:
+                self._by_tonic[song.tonic].append(i)
+            for word in tokens(song.title):
+                by_word[word].add(i)
+        # Songs with a place in a scale come first, in that order, then the rest in catalog order.
+        for scale, ids in self._by_scale.items():
+            ids.sort(key=lambda i: (self._places.get((scale, i)) is None, self._places.get((scale, i), 0), i))
+
+        # Fuzzy matching works on the vocabulary, which is far smaller than the repertoire.
+        by_trigram = defaultdict(list)
+        self._trigram_counts = {}
+        for word in by_word:
+            word_trigrams = trigrams(word)
+            for trigram in word_trigrams:
+                by_trigram[trigram].append(word)
+            self._trigram_counts[word] = len(word_trigrams)
+        self._words = sorted(by_word)
+        self._by_word = by_word
+        self._by_trigram = by_trigram
+        self._loaded = True
+
+    @timed('SongCatalog.by_scale', key=lambda self, scale: scale)
+    def by_scale(self, scale: str) -> list[str]:
+        """Return the titles played in `scale`, in their 'order' for that scale, then in catalog order."""
+        self._load()
+        return [self._songs[i].title for i in self._by_scale.get(normalize_scale(scale), ())]
+
+    def scales_of(self, title: str) -> tuple[str, ...]:
+        """Return the scales of the song called `title`, or an empty tuple if there is none."""
+        self._load()
+        i = self._by_title.get(title.lower())
+        return () if i is None else self._songs[i].scales
+
+    def _prefixed(self, prefix: str) -> set[int]:
+        found = set()
+        start = bisect.bisect_left(self._words, prefix)
+        for word in self._words[start:]:
+            if not word.startswith(prefix):
+                break
+            found |= self._by_word[word]
+        return found
+
+    @timed('SongCatalog.search')
+    def search(self, query: str = '', scale: str = None, tonic: str = None, limit: int = None) -> list[Song]:
+        """Return the songs whose title words start with every word of `query`.
+
+        `scale` and `tonic` narrow the results to songs played in that scale or tonic.
+        """
+        self._load()
+        found = None
+        for word in tokens(query):
+            matches = self._prefixed(word)
+            found = matches if found is None else found & matches
+            if not found:
+                return []
+        if scale is not None:
+            matches = set(self._by_scale.get(normalize_scale(scale), ()))
+            found = matches if found is None else found & matches
+        if tonic is not None:
+            matches = set(self._by_tonic.get(tonic, ()))
+            found = matches if found is None else found & matches
+        ids = range(len(self._songs)) if found is None else sorted(found)
+        return [self._songs[i] for i in ids[:limit]]
+
+    @timed('SongCatalog.fuzzy')
+    def fuzzy(self, query: str, limit: int = 10, cutoff: float = 0.5) -> list[Song]:
+        """Return the songs whose title words are closest to the words of `query`, best first.
+
+        Every query word is matched to the title words sharing enough trigrams with it
+        (Jaccard similarity of at least `cutoff`). A song scores the mean over the query
+        words of its best matching title word.
+        """
+        self._load()
+        query_words = tokens(query)
+        scores = defaultdict(float)
+        for query_word in query_words:
+            best = {}
+            for word, similarity in self._similar_words(query_word, cutoff):
+                for i in self._by_word[word]:
+                    if similarity > best.get(i, 0.0):
+                        best[i] = similarity
+            for i, similarity in best.items():
+                scores[i] += similarity
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return [self._songs[i] for i, _ in ranked[:limit]]
+
+    def _similar_words(self, query_word: str, cutoff: float) -> list[tuple[str, float]]:
+        query_trigrams = trigrams(query_word)
+        hits = Counter()
+        for trigram in query_trigrams:
+            hits.update(self._by_trigram.get(trigram, ()))
+        similar = []
+        for word, shared in hits.items():
+            similarity = shared / (len(query_trigrams) + self._trigram_counts[word] - shared)
+            if similarity >= cutoff:
+                similar.append((word, similarity))
+        return similar
+
+
+CATALOG = SongCatalog()
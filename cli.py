@@ -0,0 +1,119 @@
+"""Headless command line interface: stream scales as text, JSON Lines or CSV.
+
+Run ``python -m cli --help`` for the options. Nothing here imports tkinter; NumPy
+is only imported when a fretboard is requested with ``--instrument``. Scales come
+from the prebuilt snapshot when it is up to date, else from `spelling`, with every
+degree on a letter of its own as in the GUI; songs come from `songdb.open_songs`.
+"""
+import argparse
+import csv
+import json
+import sys
+
+import snapshot
+import spelling
+from keys import SCALE_NAMES, SCALES, TABLE, TONICS, mask_of
+from songdb import open_songs
+
+FORMATS = ('text', 'jsonl', 'csv')
+CSV_FIELDS = ('tonic', 'scale', 'notes', 'chords', 'songs', 'fretboard')
+
+
+def records(tonics=TONICS, scale_names=SCALE_NAMES, instrument=None):
+    """Yield one dict per (tonic, scale) with its notes, chords, songs and optional fretboard."""
+    table = snapshot.load() or spelling
+    songs = open_songs()
+    board = None
+    if instrument:
+        import instruments
+        board = instruments.fretboard(instrument)
+
+    for tonic in tonics:
+        scales = table.scales(tonic)
+        for scale_name in scale_names:
+            name = SCALES[scale_name.lower()].name
+            notes, chords = scales[name]
+            record = {
+                'tonic': tonic,
+                'scale': name,
+                'notes': list(notes),
+                'chords': chords,
+                'songs': songs.by_scale(name),
+            }
+            if board is not None:
+                record['fretboard'] = board.render(mask_of(notes), spelling.pitch_names(tonic, name, board.pitches))
+            yield record
+
+
+def write_text(rows, file):
+    first = True
+    for row in rows:
+        if not first:
+            file.write('\n')
+        first = False
+        file.write(f'{row["tonic"]} {row["scale"]} Scale: {" ".join(row["notes"])}\n')
+        file.write(f'{row["scale"]} Chords: {row["chords"]}\n')
+        file.write(f'{row["scale"]} Songs: {", ".join(row["songs"])}\n')
+        if 'fretboard' in row:
+            file.write(row['fretboard'] + '\n')
+
+
+def write_jsonl(rows, file):
+    for row in rows:
+        file.write(json.dumps(row, ensure_ascii=False) + '\n')
+
+
+def write_csv(rows, file):
+    writer = csv.writer(file)
+    writer.writerow(CSV_FIELDS)
+    for row in rows:
+        writer.writerow([row['tonic'], row['scale'], ' '.join(row['notes']), row['chords'],
+                         '; '.join(row['songs']), row.get('fretboard', '')])
+
+
+WRITERS = {'text': write_text, 'jsonl': write_jsonl, 'csv': write_csv}
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m cli', description='Print scales, chords and songs.')
+    parser.add_argument('-t', '--tonic', action='append', dest='tonics', metavar='TONIC',
+                        help=f'tonic to print, may be repeated (default: {" ".join(TONICS)})')
+    parser.add_argument('-s', '--scale', action='append', dest='scales', metavar='SCALE',
+                        help='scale to print, may be repeated (default: all)')
+    parser.add_argument('-f', '--format', choices=FORMATS, default='text', help='output format (default: text)')
+    parser.add_argument('-o', '--output', metavar='FILE', help='write to FILE instead of stdout')
+    parser.add_argument('-i', '--instrument', metavar='INSTRUMENT',
+                        help="add a fretboard for a named instrument or a tuning such as 'D A D'")
+    args = parser.parse_args(argv)
+
+    for scale_name in args.scales or ():
+        if scale_name.lower() not in SCALES:
+            parser.error(f"unknown scale '{scale_name}', choose from {', '.join(SCALE_NAMES)}")
+    for tonic in args.tonics or ():
+        try:
+            TABLE.scales(tonic)
+        except ValueError:
+            parser.error(f"invalid tonic '{tonic}'")
+    if args.instrument:
+        import instruments
+        try:
+            # Built once here, `records` gets the same cached fretboard.
+            instruments.fretboard(args.instrument)
+        except ValueError as error:
+            parser.error(f"unknown instrument or tuning '{args.instrument}', choose from "
+                         f"{', '.join(instruments.INSTRUMENTS)} or give notes such as 'D A D' ({error})")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    rows = records(args.tonics or TONICS, args.scales or SCALE_NAMES, args.instrument)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8', newline='') as file:
+            WRITERS[args.format](rows, file)
+    else:
+        WRITERS[args.format](rows, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
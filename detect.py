@@ -0,0 +1,199 @@
+"""Live dromos detection: estimate the (tonic, scale) being played from PCM audio.
+
+Audio is cut into overlapping Hann windows. Each window's spectrum is folded onto
+the 12 pitch classes and added to a running histogram, which is matched against
+every registered scale on every tonic by `identify.ScaleIndex.fit`. All buffers are allocated once
+per `PitchClassTracker`, so feeding audio allocates almost nothing. Run
+``python -m detect FILE.wav`` to follow a recording.
+"""
+import argparse
+import wave
+
+import numpy as np
+
+import identify
+import keys
+
+WINDOW = 8192
+HOP = 2048
+LOWEST = 110.0
+HIGHEST = 1760.0
+
+# A candidate scale with its score against the pitch-class histogram.
+Estimate = identify.Fit
+
+
+class PitchClassTracker:
+    """An incremental pitch-class histogram of a mono PCM stream, matched against the scales.
+
+    Parameters:
+    ----------
+    sample_rate:
+        The sampling rate of the stream in Hz.
+    half_life:
+        Seconds after which a window's weight in the histogram has halved, or None to
+        weigh the whole stream equally. It must be positive.
+    window:
+        The FFT window length in samples.
+    hop:
+        The samples between the starts of consecutive windows.
+    tonics, scales:
+        The tonics and scale registry to match against, as for `identify.ScaleIndex`.
+
+    Attributes:
+    ----------
+    histogram:
+        The energy per pitch class so far, 'A' first.
+    seconds:
+        The length of audio fed so far.
+
+    Functions:
+    ---------
+    feed(samples) -> int:
+        Add 16-bit PCM bytes or an array of samples, returning the windows analyzed.
+    ranking(limit: int) -> list[Estimate]:
+        Return the best matching scales, best first.
+    best() -> Estimate:
+        Return the best matching scale.
+    """
+
+    def __init__(self, sample_rate, half_life=None, window=WINDOW, hop=HOP, tonics=keys.TONICS,
+                 scales=keys.SCALES):
+        if not 0 < hop <= window:
+            raise ValueError("The hop must be between 1 and the window length.")
+        if half_life is not None and not half_life > 0:
+            raise ValueError("The half-life must be a positive number of seconds.")
+        self.sample_rate = sample_rate
+        self.window = window
+        self.hop = hop
+        self.decay = 1.0 if half_life is None else 0.5 ** (hop / (half_life * sample_rate))
+        self.histogram = np.zeros(12)
+        self.seconds = 0.0
+
+        self._hann = np.hanning(window)
+        self._samples = np.zeros(window)
+        self._frame = np.empty(window)
+        self._spectrum = np.empty(window // 2 + 1, dtype=complex)
+        self._magnitude = np.empty(window // 2 + 1)
+        self._classes = np.empty(12)
+        self._filled = 0
+        # The odd byte at the end of the last chunk of PCM bytes, waiting for its other half.
+        self._pending = b''
+        # Every FFT bin in the pitched range feeds the pitch class nearest to its frequency.
+        frequencies = np.fft.rfftfreq(window, 1 / sample_rate)
+        in_range = (frequencies >= LOWEST) & (frequencies <= HIGHEST)
+        nearest = np.rint(12 * np.log2(np.where(in_range, frequencies, LOWEST) / LOWEST)).astype(int) % 12
+        self._fold = np.zeros((len(frequencies), 12))
+        self._fold[in_range, nearest[in_range]] = 1.0
+
+        if tonics is keys.TONICS and scales is keys.SCALES:
+            self._index = identify.INDEX
+        else:
+            self._index = identify.ScaleIndex(tonics, scales)
+        self.catalog = self._index.catalog
+
+    def feed(self, samples) -> int:
+        """Add 16-bit PCM bytes or an array of samples, returning the number of windows analyzed.
+
+        Bytes may be split anywhere, even inside a sample: an odd last byte waits for the next chunk.
+        """
+        if isinstance(samples, (bytes, bytearray, memoryview)):
+            if self._pending:
+                samples = self._pending + samples
+            size = memoryview(samples).nbytes
+            self._pending = bytes(memoryview(samples).cast('B')[size - size % 2:])
+            samples = np.frombuffer(samples, dtype='<i2', count=size // 2)
+        self.seconds += len(samples) / self.sample_rate
+        windows = start = 0
+        while start < len(samples):
+            # The newest `_filled` samples of the hop wait at the end of `_samples`.
+            take = min(self.hop - self._filled, len(samples) - start)
+            self._samples[:-take] = self._samples[take:]
+            self._samples[-take:] = samples[start:start + take]
+            self._filled += take
+            start += take
+            if self._filled == self.hop:
+                self._filled = 0
+                self._analyze()
+                windows += 1
+        return windows
+
+    def _analyze(self):
+        np.multiply(self._samples, self._hann, out=self._frame)
+        np.fft.rfft(self._frame, out=self._spectrum)
+        np.abs(self._spectrum, out=self._magnitude)
+        # Power rather than amplitude keeps the leakage around each peak out of its neighbours.
+        np.square(self._magnitude, out=self._magnitude)
+        np.dot(self._magnitude, self._fold, out=self._classes)
+        total = self._classes.sum()
+        self.histogram *= self.decay
+        if total > 1e-9:
+            # Every sounding window counts the same, whatever its loudness.
+            self.histogram += self._classes / total
+
+    def ranking(self, limit: int = 5) -> list[Estimate]:
+        """Return the `limit` scales best matching the histogram, best first, as scored by `identify.fit`."""
+        return self._index.fit(self.histogram.tolist(), limit)
+
+    def best(self) -> Estimate:
+        """Return the scale whose template best matches the histogram, or None before any sound."""
+        ranking = self.ranking(1)
+        return ranking[0] if ranking else None
+
+
+def read_wav(path, block_frames: int = 8192):
+    """Yield the sample rate of a 16-bit WAV file at `path`, then its samples as mono blocks."""
+    with wave.open(path, 'rb') as file:
+        if file.getsampwidth() != 2:
+            raise ValueError(f"'{path}' is not a 16-bit WAV file.")
+        channels = file.getnchannels()
+        yield file.getframerate()
+        while True:
+            data = file.readframes(block_frames)
+            if not data:
+                break
+            samples = np.frombuffer(data, dtype='<i2')
+            yield samples if channels == 1 else samples.reshape(-1, channels).mean(axis=1)
+
+
+def listen(path, half_life=None, block_frames: int = 8192):
+    """Yield a `PitchClassTracker` after every block of the WAV file at `path` is fed to it."""
+    blocks = read_wav(path, block_frames)
+    tracker = PitchClassTracker(next(blocks), half_life)
+    for samples in blocks:
+        tracker.feed(samples)
+        yield tracker
+
+
+def detect_wav(path, limit: int = 5) -> list[Estimate]:
+    """Return the scales best matching the whole WAV file at `path`, best first."""
+    tracker = None
+    for tracker in listen(path):
+        pass
+    return tracker.ranking(limit) if tracker else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m detect', description='Follow the dromos of a WAV file.')
+    parser.add_argument('path', help='16-bit PCM WAV file to analyze')
+    parser.add_argument('--half-life', type=float, help='seconds to forget half of the past (default: never)')
+    parser.add_argument('--every', type=float, default=1.0, help='seconds between reports (default: 1)')
+    args = parser.parse_args(argv)
+    if args.half_life is not None and not args.half_life > 0:
+        parser.error('--half-life must be a positive number of seconds')
+
+    reported = 0.0
+    tracker = None
+    for tracker in listen(args.path, args.half_life):
+        if tracker.seconds - reported >= args.every:
+            reported = tracker.seconds
+            estimate = tracker.best()
+            if estimate:
+                print(f'{tracker.seconds:8.1f} s  {estimate.tonic} {estimate.scale} ({estimate.score:.2f})')
+    if tracker:
+        for estimate in tracker.ranking():
+            print(f'{estimate.tonic} {estimate.scale}: {estimate.score:.3f}')
+
+
+if __name__ == '__main__':
+    main()
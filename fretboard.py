@@ -0,0 +1,100 @@
+"""Fretboard model: a strings x frets matrix of pitch classes rendered as text.
+
+The default board reproduces `examples.fretboard`: a D/A/D tuning with 24 frets,
+spelled with the mix of sharps and flats used there.
+"""
+import numpy as np
+
+import keys
+from profiling import timed
+
+MIXED_PITCHES = "A   Bb  B   C   C#  D   Eb  E   F   F#  G   Ab".split()
+DEFAULT_TUNING = ('D', 'A', 'D')
+DEFAULT_FRETS = 24
+
+
+class Fretboard:
+    """A fretted instrument neck as a NumPy pitch-class matrix.
+
+    Parameters:
+    ----------
+    tuning:
+        The open string note names, in display order.
+    frets:
+        The number of frets after the open string.
+    pitches:
+        The 12 note names, starting on 'A', used to spell the board.
+
+    Attributes:
+    ----------
+    pitch_classes:
+        An integer array of shape (strings, frets + 1) holding the pitch class of
+        every position, with the open strings in column 0.
+
+    Functions:
+    ---------
+    highlight(mask: int) -> np.ndarray:
+        Return a boolean array marking the positions whose pitch class is in `mask`.
+    render(mask: int, pitches: tuple[str, ...]) -> str:
+        Return the board as text with the notes outside `mask` blanked out, spelled
+        with `pitches` if given.
+    """
+
+    def __init__(self, tuning=DEFAULT_TUNING, frets=DEFAULT_FRETS, pitches=MIXED_PITCHES):
+        if frets < 1:
+            raise ValueError("A fretboard needs at least one fret.")
+        self.tuning = tuple(tuning)
+        self.frets = frets
+        self.pitches = tuple(pitches)
+        open_strings = np.array([keys.pitch_class(note) for note in self.tuning], dtype=np.int64)
+        self.pitch_classes = (open_strings[:, None] + np.arange(frets + 1)) % 12
+
+        self._columns = np.arange(12)
+        self._spellings = {}
+        self._labels, self._cells, self._last, self._header = self._tables(self.pitches)
+
+    def _tables(self, pitches):
+        # One lookup table per column kind: open string label, padded cell and the
+        # unpadded last cell, each with the note name (row 1) or a blank (row 0),
+        # and the fret numbers, all sized for the names in `pitches`.
+        try:
+            return self._spellings[pitches]
+        except KeyError:
+            pass
+        open_strings = self.pitch_classes[:, 0]
+        label_width = max(len(pitches[pitch_class]) for pitch_class in open_strings)
+        width = max(max(len(pitch) for pitch in pitches), len(str(self.frets))) + 2
+        names = np.array(pitches, dtype=object)
+        labels = np.array([['-'.ljust(label_width) + ' |  '] * 12,
+                           [name.ljust(label_width) + ' |  ' for name in names]], dtype=object)
+        cells = np.array([['-'.ljust(width)] * 12, [name.ljust(width) for name in names]], dtype=object)
+        last = np.array([['-'] * 12, list(names)], dtype=object)
+        header = ('0'.ljust(label_width) + ' |  '
+                  + ''.join(str(fret).ljust(width) for fret in range(1, self.frets)) + str(self.frets))
+        tables = self._spellings[pitches] = labels, cells, last, header
+        return tables
+
+    def highlight(self, mask: int) -> np.ndarray:
+        """Return a boolean array marking the positions whose pitch class is in `mask`."""
+        return (mask >> self.pitch_classes) & 1 == 1
+
+    @timed('Fretboard.render', key=lambda self, mask=keys.FULL_MASK, pitches=None: f'{len(self.tuning)}x{self.frets}')
+    def render(self, mask: int = keys.FULL_MASK, pitches=None) -> str:
+        """Return the board as text with the notes outside `mask` blanked out.
+
+        `pitches`, 12 note names starting on 'A', spells this rendering instead of the
+        board's own names, e.g. with the degrees of a scale from `spelling.pitch_names`.
+        """
+        if pitches is None:
+            labels, cells_table, last, header = self._labels, self._cells, self._last, self._header
+        else:
+            labels, cells_table, last, header = self._tables(tuple(pitches))
+        bits = (mask >> self._columns) & 1
+        grid = self.pitch_classes
+        cells = np.empty((grid.shape[0], grid.shape[1] + 1), dtype=object)
+        cells[:, 0] = labels[bits, self._columns][grid[:, 0]]
+        cells[:, 1:-2] = cells_table[bits, self._columns][grid[:, 1:-1]]
+        cells[:, -2] = last[bits, self._columns][grid[:, -1]]
+        cells[:-1, -1] = '\n'
+        cells[-1, -1] = ''
+        return header + '\n' + ''.join(cells.ravel())
@@ -0,0 +1,160 @@
+"""Harmonization: the chords on every degree of a scale and the progressions they form.
+
+A degree table depends only on the interval pattern of a scale, so it is computed once
+per pattern and shared by every tonic, and by scales with the same pattern such as
+Major and Rast. Ranked progressions are likewise kept per scale relative to the tonic,
+and moved to each pitch class once by adding it to every root, so the progressions of
+the whole catalog are table lookups. Run ``python -m harmony TONIC SCALE`` to print them.
+"""
+import argparse
+import sys
+from functools import lru_cache
+from typing import NamedTuple
+
+import keys
+
+QUALITY_NAMES = {intervals: quality for quality, intervals in keys.CHORD_QUALITIES.items()}
+
+ROMAN_NUMERALS = ('I', 'II', 'III', 'IV', 'V', 'VI', 'VII', 'VIII', 'IX', 'X', 'XI', 'XII')
+# Roman numeral suffixes of the qualities whose suffix is not the quality itself.
+ROMAN_SUFFIXES = {'m': '', 'dim': '°', 'aug': '+', 'm7': '7', 'm7b5': 'ø7', 'dim7': '°7', 'm6': '6',
+                  'mmaj7': 'maj7', '7#5': '+7', 'maj7#5': '+maj7'}
+
+# Progressions as scale degrees with a weight for how common they are, 1 being the most.
+PROGRESSIONS = {
+    'I-IV-V-I': ((1, 4, 5, 1), 1.0),
+    'I-II-I': ((1, 2, 1), 0.9),  # The rebetiko cadence over the second degree, as in Xitzaz.
+    'I-V-I': ((1, 5, 1), 0.9),
+    'I-IV-V': ((1, 4, 5), 0.8),
+    'IV-III-II-I': ((4, 3, 2, 1), 0.8),  # The descending tetrachord cadence, as in Ousak.
+    'I-IV-I': ((1, 4, 1), 0.7),
+    'I-VII-I': ((1, 7, 1), 0.7),
+    'II-V-I': ((2, 5, 1), 0.6),
+    'I-VI-IV-V': ((1, 6, 4, 5), 0.5),
+}
+
+
+class DegreeChord(NamedTuple):
+    """The chord on a scale `degree`, its root `offset` in semitones above the tonic and its quality.
+
+    `quality` is None when the stacked thirds of the scale make no chord of `keys.CHORD_QUALITIES`.
+    """
+    degree: int
+    offset: int
+    quality: str
+
+
+class Progression(NamedTuple):
+    """A progression of a scale on a tonic, with the score it is ranked by."""
+    name: str
+    roman: str
+    chords: tuple
+    score: float
+
+    def names(self, pitches=keys.Scale.SHARP_PITCHES) -> list[str]:
+        """Return the chord names with their roots spelled from `pitches`."""
+        return [chord.name(pitches) for chord in self.chords]
+
+
+def roman(degree: int, quality: str) -> str:
+    """Return the Roman numeral of the chord of `quality` on `degree`, lowercase when minor."""
+    numeral = ROMAN_NUMERALS[degree - 1]
+    if keys.CHORD_QUALITIES[quality][1] == 3:
+        numeral = numeral.lower()
+    return numeral + ROMAN_SUFFIXES.get(quality, quality)
+
+
+@lru_cache(maxsize=None)
+def degree_table(intervals: str, seventh: bool = False) -> tuple[DegreeChord, ...]:
+    """Return the chord stacked in thirds from the scale on each degree of the pattern `intervals`.
+
+    Chords are triads, or seventh chords with `seventh`.
+    """
+    offsets = [0]
+    for interval in intervals:
+        offsets.append(offsets[-1] + keys.Scale.INTERVALS[interval])
+    degrees, span = offsets[:-1], offsets[-1]
+    size = 4 if seventh else 3
+    table = []
+    for i, root in enumerate(degrees):
+        notes = [degrees[(i + 2 * k) % len(degrees)] + span * ((i + 2 * k) // len(degrees)) for k in range(size)]
+        table.append(DegreeChord(i + 1, root, QUALITY_NAMES.get(tuple(note - root for note in notes))))
+    return tuple(table)
+
+
+@lru_cache(maxsize=None)
+def _ranked(scale_name: str, seventh: bool) -> tuple:
+    # The progressions of a scale relative to its tonic, best first, as
+    # (name, roman, ((offset, quality), ...), score).
+    definition = keys.SCALES[scale_name.lower()]
+    table = degree_table(definition.intervals, seventh)
+    listed = {degree for degree, _ in definition.chords}
+    ranked = []
+    for name, (degrees, weight) in PROGRESSIONS.items():
+        if max(degrees) > len(table) or any(table[degree - 1].quality is None for degree in degrees):
+            continue
+        chords = tuple((table[degree - 1].offset, table[degree - 1].quality) for degree in degrees)
+        # Degrees the scale lists among its own chords are idiomatic in the repertoire.
+        idiomatic = len(listed.intersection(degrees)) / len(set(degrees))
+        ranked.append((name, '-'.join(roman(degree, table[degree - 1].quality) for degree in degrees),
+                       chords, weight * (0.5 + 0.5 * idiomatic)))
+    ranked.sort(key=lambda progression: -progression[3])
+    return tuple(ranked)
+
+
+@lru_cache(maxsize=None)
+def _on_root(scale_name: str, seventh: bool, root: int) -> tuple[Progression, ...]:
+    return tuple(Progression(name, numerals,
+                             tuple(keys.Chord((root + offset) % 12, quality) for offset, quality in chords), score)
+                 for name, numerals, chords, score in _ranked(scale_name.lower(), seventh))
+
+
+def progressions(tonic: str, scale_name: str, seventh: bool = False, limit: int = None) -> list[Progression]:
+    """Return the progressions of the scale `scale_name` on `tonic`, best first."""
+    return list(_on_root(scale_name, seventh, keys.pitch_class(tonic))[:limit])
+
+
+def transpose(progression: Progression, semitones: int) -> Progression:
+    """Return `progression` moved up by `semitones`."""
+    return progression._replace(chords=tuple(keys.Chord((chord.root + semitones) % 12, chord.quality)
+                                             for chord in progression.chords))
+
+
+def harmonize(tonic: str, scale_name: str, seventh: bool = False) -> list[keys.Chord]:
+    """Return the chord on every degree of the scale `scale_name` on `tonic`, None where there is none."""
+    root = keys.pitch_class(tonic)
+    return [None if quality is None else keys.Chord((root + offset) % 12, quality)
+            for _, offset, quality in degree_table(keys.SCALES[scale_name.lower()].intervals, seventh)]
+
+
+def all_progressions(tonics=keys.TONICS, scale_names=keys.SCALE_NAMES, seventh: bool = False, limit: int = None):
+    """Return {(tonic, scale name): progressions} for every tonic and scale of the catalog."""
+    return {(tonic, scale_name): progressions(tonic, scale_name, seventh, limit)
+            for tonic in tonics for scale_name in scale_names}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m harmony',
+                                     description='Print the chords and progressions of a scale.')
+    parser.add_argument('tonic', help='tonic of the scale')
+    parser.add_argument('scale', help='name of the scale')
+    parser.add_argument('--seventh', action='store_true', help='use seventh chords instead of triads')
+    args = parser.parse_args(argv)
+    if args.scale.lower() not in keys.SCALES:
+        parser.error(f"unknown scale '{args.scale}', choose from {', '.join(keys.SCALE_NAMES)}")
+    if args.tonic not in keys.TABLE.tonics:
+        parser.error(f"invalid tonic '{args.tonic}'")
+
+    pitches = keys.Scale.for_tonic(args.tonic).pitches
+    table = degree_table(keys.SCALES[args.scale.lower()].intervals, args.seventh)
+    chords = harmonize(args.tonic, args.scale, args.seventh)
+    for (degree, _, quality), chord in zip(table, chords):
+        print(f'{degree}: ' + ('-' if chord is None else f'{roman(degree, quality):<8} {chord.name(pitches)}'))
+    print()
+    for progression in progressions(args.tonic, args.scale, args.seventh):
+        print(f'{progression.roman:<24} {" ".join(progression.names(pitches)):<24} {progression.score:.2f}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
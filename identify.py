@@ -0,0 +1,159 @@
+"""Reverse lookup: find the (tonic, scale) pairs that fit a set of notes or chords.
+
+The catalog is every registered scale on every tonic of `keys.TONICS`. It is indexed
+once by pitch class, so a query is a handful of integer ANDs instead of a scan of
+every `Scale` method.
+"""
+from typing import NamedTuple
+
+import keys
+
+
+class Match(NamedTuple):
+    """A candidate scale for a query, with the measures it is ranked by."""
+    tonic: str
+    scale: str
+    chord_matches: int
+    extra_notes: int
+    tonic_matches: bool
+
+
+class Fit(NamedTuple):
+    """A candidate scale for a pitch-class histogram, with its template score."""
+    tonic: str
+    scale: str
+    score: float
+
+
+# Weight of the tonic's share of a histogram next to the in-scale and out-of-scale shares.
+TONIC_WEIGHT = 1.0
+
+
+class ScaleIndex:
+    """An inverted index from pitch classes to the catalog scales that contain them.
+
+    Parameters:
+    ----------
+    tonics:
+        The tonics to index, one per pitch class, defaults to `keys.TONICS`.
+    scales:
+        The scale registry to index, defaults to `keys.SCALES`.
+
+    Functions:
+    ---------
+    candidates(notes_mask: int) -> list[int]:
+        Return the catalog ids of every scale containing all of `notes_mask`.
+    identify(notes=(), chords=()) -> list[Match]:
+        Return the scales containing the notes and chords, best fit first.
+    fit(weights, limit: int) -> list[Fit]:
+        Return the scales best matching a pitch-class histogram, best first.
+    """
+
+    def __init__(self, tonics=keys.TONICS, scales=keys.SCALES):
+        self.catalog = []
+        self._masks = []
+        self._chords = []
+        self._tonics = []
+        by_pitch_class = [0] * 12
+        for tonic in tonics:
+            tonic_class = keys.pitch_class(tonic)
+            for definition in scales.values():
+                mask = keys.transpose(definition.mask, tonic_class)
+                bit = 1 << len(self.catalog)
+                for pitch_class in range(12):
+                    if mask >> pitch_class & 1:
+                        by_pitch_class[pitch_class] |= bit
+                self.catalog.append((tonic, definition.name))
+                self._masks.append(mask)
+                self._tonics.append(tonic_class)
+                chords = frozenset(keys.Chord((tonic_class + definition.offsets[degree - 1]) % 12, quality)
+                                   for degree, quality in definition.chords)
+                self._chords.append(chords)
+        self._by_pitch_class = by_pitch_class
+        self._all = (1 << len(self.catalog)) - 1
+        self._candidates = {}
+
+    def candidates(self, notes_mask: int) -> list[int]:
+        """Return the catalog ids of every scale containing all of `notes_mask`."""
+        try:
+            return self._candidates[notes_mask]
+        except KeyError:
+            pass
+        found = self._all
+        for pitch_class in range(12):
+            if notes_mask >> pitch_class & 1:
+                found &= self._by_pitch_class[pitch_class]
+        ids = []
+        while found:
+            low = found & -found
+            ids.append(low.bit_length() - 1)
+            found ^= low
+        self._candidates[notes_mask] = ids
+        return ids
+
+    def identify(self, notes=(), chords=()) -> list[Match]:
+        """Return the scales containing every note of `notes` and every tone of `chords`.
+
+        Matches are ranked by the number of `chords` the scale lists among its own chords,
+        then by how few notes the scale adds to the query, then by whether the first note
+        (or the first chord root) is the scale's tonic.
+        """
+        # `notes` may be any iterable, read twice below.
+        notes = tuple(notes)
+        parsed = [keys.Chord.parse(chord) for chord in chords]
+        notes_mask = keys.mask_of(notes)
+        for chord in parsed:
+            notes_mask |= chord.mask()
+
+        if notes:
+            first = keys.pitch_class(notes[0])
+        elif parsed:
+            first = parsed[0].root
+        else:
+            first = None
+
+        matches = []
+        for i in self.candidates(notes_mask):
+            listed = self._chords[i]
+            tonic, scale = self.catalog[i]
+            matches.append(Match(tonic, scale,
+                                 sum(chord in listed for chord in parsed),
+                                 (self._masks[i] & ~notes_mask).bit_count(),
+                                 self._tonics[i] == first))
+        matches.sort(key=lambda match: (-match.chord_matches, match.extra_notes, not match.tonic_matches))
+        return matches
+
+    def fit(self, weights, limit: int = 5) -> list[Fit]:
+        """Return the `limit` scales best matching the 12 pitch-class `weights`, 'A' first.
+
+        Unlike `identify`, notes outside a scale only lower its score, so passing notes
+        and ornaments do not rule it out. A scale scores the share of the weight inside
+        it minus the share outside it, plus `TONIC_WEIGHT` times the share of its tonic.
+        """
+        total = sum(weights)
+        if not total:
+            return []
+        shares = [weight / total for weight in weights]
+        inside = {}
+        fits = []
+        for i, mask in enumerate(self._masks):
+            share = inside.get(mask)
+            if share is None:
+                share = inside[mask] = sum(shares[pitch_class] for pitch_class in range(12) if mask >> pitch_class & 1)
+            tonic, scale = self.catalog[i]
+            fits.append(Fit(tonic, scale, 2 * share - 1 + TONIC_WEIGHT * shares[self._tonics[i]]))
+        fits.sort(key=lambda fit: -fit.score)
+        return fits[:limit]
+
+
+INDEX = ScaleIndex()
+
+
+def identify(notes=(), chords=()) -> list[Match]:
+    """Return the catalog scales that fit `notes` and `chords`, best fit first."""
+    return INDEX.identify(notes, chords)
+
+
+def fit(weights, limit: int = 5) -> list[Fit]:
+    """Return the catalog scales best matching the 12 pitch-class `weights`, best first."""
+    return INDEX.fit(weights, limit)
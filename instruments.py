@@ -0,0 +1,64 @@
+"""Instrument tunings and their cached fretboard layouts.
+
+Strings are listed top to bottom as they are displayed, i.e. highest string first,
+the same way `examples.fretboard` shows the 3-course bouzouki.
+"""
+from functools import lru_cache
+from typing import NamedTuple
+
+from fretboard import DEFAULT_FRETS, MIXED_PITCHES, Fretboard
+from keys import Scale
+
+SPELLINGS = {
+    'mixed': tuple(MIXED_PITCHES),
+    'sharp': tuple(Scale.SHARP_PITCHES),
+    'flat': tuple(Scale.FLAT_PITCHES),
+}
+
+
+class Instrument(NamedTuple):
+    """A named tuning with its number of frets."""
+    name: str
+    tuning: tuple[str, ...]
+    frets: int
+
+
+INSTRUMENTS = {
+    'bouzouki3': Instrument('Bouzouki (3-course)', ('D', 'A', 'D'), DEFAULT_FRETS),
+    'bouzouki4': Instrument('Bouzouki (4-course)', ('D', 'A', 'F', 'C'), DEFAULT_FRETS),
+    'baglamas': Instrument('Baglamas', ('D', 'A', 'D'), 20),
+    'oud': Instrument('Oud', ('C', 'G', 'D', 'A', 'F', 'C'), 12),
+    'guitar': Instrument('Guitar', ('E', 'B', 'G', 'D', 'A', 'E'), 22),
+}
+DEFAULT_INSTRUMENT = 'bouzouki3'
+
+
+def parse_tuning(tuning) -> tuple[str, ...]:
+    """Return `tuning` as a tuple of note names, accepting e.g. 'D A D' or ['D', 'A', 'D']."""
+    if isinstance(tuning, str):
+        tuning = tuning.replace('-', ' ').split()
+    if not tuning:
+        raise ValueError("A tuning needs at least one string.")
+    return tuple(tuning)
+
+
+@lru_cache(maxsize=32)
+def layout(tuning: tuple[str, ...], frets: int, spelling: str = 'mixed') -> Fretboard:
+    """Return the `Fretboard` for `tuning`, `frets` and `spelling`, built once per combination."""
+    try:
+        pitches = SPELLINGS[spelling]
+    except KeyError:
+        raise ValueError(f"Unknown spelling '{spelling}', use one of {', '.join(SPELLINGS)}.") from None
+    return Fretboard(tuning, frets, pitches)
+
+
+def fretboard(instrument: str = DEFAULT_INSTRUMENT, frets: int = None, spelling: str = 'mixed') -> Fretboard:
+    """Return the cached `Fretboard` of a named instrument or of a custom tuning such as 'D G D'.
+
+    `frets` defaults to the instrument's own fret count, or `DEFAULT_FRETS` for custom tunings.
+    """
+    if instrument in INSTRUMENTS:
+        _, tuning, default_frets = INSTRUMENTS[instrument]
+    else:
+        tuning, default_frets = parse_tuning(instrument), DEFAULT_FRETS
+    return layout(tuning, frets or default_frets, spelling)
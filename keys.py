@@ -2,6 +2,19 @@
 
 https://exercism.org/tracks/python/exercises/scale-generator
 """
+import json
+import os
+import sys
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+
+from profiling import timed
+
+SCALES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scales.json')
+TONICS = ('A', 'Bb', 'B', 'C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab')
 
 
 class Scale:
@@ -13,11 +26,19 @@ class Scale:
     ----------
     tonic:
         A string character representing the tonic scale to generate.
+    edo:
+        The number of equal steps per octave, 12 by default. Finer resolutions such as
+        24 or 53 add the quarter-tone intervals of `QUARTER_TONES`, each note rounded to
+        the nearest step.
 
     Attributes:
     ----------
     tonic:
         A string character representing the tonic scale to generate.
+    edo:
+        The number of equal steps per octave.
+    tuning:
+        The `EDO` naming the steps of a resolution other than 12, otherwise None.
     pitches:
         A list of strings representing the pitches in the `Scale` objects chromatic scale.
     tonic_index:
@@ -38,10 +59,25 @@ class Scale:
 
     Functions:
     ---------
+    for_tonic(tonic: str) -> Scale:
+        Return a shared `Scale` for `tonic`, constructed once per tonic.
     chromatic() -> list[str]:
         Return the chromatic scale of the `Scale` objects given `tonic`.
     interval(intervals: str) -> list[str]:
         Return a diatonic scale of the `Scale` objects `tonic`, with the given `intervals`.
+    scale(name: str) -> tuple[list[str], str]:
+        Return the registered scale `name` and its chords. Every entry of `SCALES` is
+        also available as a method, e.g. `Scale('D').ousak()`.
+    chords(name: str) -> tuple[Chord, ...]:
+        Return the chords of the registered scale `name` as `Chord` objects.
+    voicings(name: str, seventh: bool) -> list[list[str]]:
+        Return the notes of each chord of `name`, stacked in thirds from the scale.
+    scale_all() -> dict[str, tuple[list[str], str]]:
+        Return every registered scale and its chords, keyed by display name.
+    result(name: str) -> ScaleResult:
+        Return the registered scale `name` as a compact `ScaleResult`.
+    results() -> dict[str, ScaleResult]:
+        Return every registered scale as a `ScaleResult`, keyed by display name.
     validate_tonic(tonic: str) -> str:
         Return a ValueError if `tonic` is invalid.
     validate_intervals(intervals: str) -> str:
@@ -59,414 +95,545 @@ class Scale:
     FLAT_TONES = "Ab  Bb  Cb  Db  Eb  F   Gb  ab  bb  c   d   eb  f   g ".split()
     INTERVALS = {"m": 1, "M": 2, "A": 3}
 
-    def __init__(self, tonic: str):
+    _VALID_TONICS = frozenset(SHARP_TONES + FLAT_TONES)
+    _SHARP_TONE_SET = frozenset(SHARP_TONES)
+    _SHARP_INDEX = {pitch: i for i, pitch in enumerate(SHARP_PITCHES)}
+    _FLAT_INDEX = {pitch: i for i, pitch in enumerate(FLAT_PITCHES)}
+    _INTERVAL_SET = frozenset(INTERVALS)
+    # The pitch tables every `ScaleResult` indexes into, one interned string per note name.
+    _SHARP_TABLE = tuple(map(sys.intern, SHARP_PITCHES))
+    _FLAT_TABLE = tuple(map(sys.intern, FLAT_PITCHES))
+    _instances = {}
+
+    @timed('Scale.__init__', key=lambda self, tonic, edo=12: tonic)
+    def __init__(self, tonic: str, edo: int = 12):
         self.tonic = self.validate_tonic(tonic)
-        self.pitches = self.SHARP_PITCHES if tonic in self.SHARP_TONES else self.FLAT_PITCHES
-        self.tonic_index = self.pitches.index(self.tonic.capitalize())
+        if tonic in self._SHARP_TONE_SET:
+            self.pitches, index = self.SHARP_PITCHES, self._SHARP_INDEX
+        else:
+            self.pitches, index = self.FLAT_PITCHES, self._FLAT_INDEX
+        try:
+            self.tonic_index = index[tonic.capitalize()]
+        except KeyError:
+            raise ValueError(f"Tonic '{tonic}' has no pitch in the `Scale` objects chromatic scale.") from None
+        self.edo = edo
+        self.tuning = None if edo == 12 else EDO.for_pitches(edo, self.pitches)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._instances = {}
+
+    @classmethod
+    def for_tonic(cls, tonic: str) -> 'Scale':
+        """Return a shared `Scale` for `tonic`, constructed on first use. Treat it as read-only."""
+        try:
+            return cls._instances[tonic]
+        except KeyError:
+            scale = cls._instances[tonic] = cls(tonic)
+            return scale
 
     def chromatic(self) -> list[str]:
         """Return the chromatic scale of the `Scale` objects given `tonic`."""
+        if self.tuning:
+            names, i = self.tuning.names, self.tuning.step(2 * self.tonic_index)
+            return list(names[i:] + names[:i])
         return self.pitches[self.tonic_index:] + self.pitches[:self.tonic_index]
 
     def interval(self, intervals: str) -> list[str]:
         """Return a diatonic scale of the `Scale` objects `tonic`, with the given `intervals`."""
+        if self.tuning:
+            return self._walk(self.validate_intervals(intervals))
         i = self.tonic_index
-        diatonic_scale = [self.pitches[i]]
+        pitches = self.pitches
+        steps = self.INTERVALS
+        diatonic_scale = [pitches[i]]
         for interval in self.validate_intervals(intervals):
-            i = (i + self.INTERVALS[interval]) % 12
-            diatonic_scale.append(self.pitches[i])
+            i = (i + steps[interval]) % 12
+            diatonic_scale.append(pitches[i])
 
         return diatonic_scale
 
-    def major(self):
-        i = self.tonic_index
-        major_scale = [self.pitches[i]]
-        for interval in ["M", "M", "m", "M", "M", "M", "m"]:
-            i = (i + self.INTERVALS[interval]) % 12
-            major_scale.append(self.pitches[i])
-
-        basic = major_scale[0]
-        fifth = major_scale[4]
-        fourth = major_scale[3]
-        second = major_scale[1]
-
-        chords = f'{basic}, {fifth}, {fourth}, {second}'
-        return major_scale, chords
-
-    def minor(self):
-        i = self.tonic_index
-        minor_scale = [self.pitches[i]]
-        for interval in ['M', 'm', 'M', 'M', 'm', 'M', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            minor_scale.append(self.pitches[i])
-
-        basic = minor_scale[0] + 'm'
-        fifth = minor_scale[4]
-        fourth = minor_scale[3] + 'm'
-        sixth = minor_scale[5]
-        chords = f'{basic}, {fifth}, {fourth}, {sixth}'
-
-        return minor_scale, chords
-
-
-    def ousak(self):
-        i = self.tonic_index
-        ousak_scale = [self.pitches[i]]
-        for interval in ['m','M','M','M','m','M','M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            ousak_scale.append(self.pitches[i])
-
-        basic = ousak_scale[0] + 'm'
-        second = ousak_scale[1]
-        third = ousak_scale[2]
-        fourth = ousak_scale[3] + 'm'
-        sixth = ousak_scale[5]
-        seventh = ousak_scale[6] + 'm'
-        chords = f'{basic}, {second}, {third}, {fourth}, {sixth}, {seventh}'
-
-        return ousak_scale, chords
-
-    def xitzaz(self):
-        i = self.tonic_index
-        xitzaz_scale = [self.pitches[i]]
-        for interval in ['m','A','m','M','m','M','M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            xitzaz_scale.append(self.pitches[i])
-
-        basic = xitzaz_scale[0]
-        second = xitzaz_scale[1]
-        fourth = xitzaz_scale[3]
-        seventh = xitzaz_scale[6]
-
-        chords = f'{basic}, {second}, {fourth}, {seventh}'
-
-        return xitzaz_scale, chords
-
-
-    def armoniko(self):
-        i = self.tonic_index
-        armoniko_scale = [self.pitches[i]]
-        for interval in ['M','m','M','M','m','A','m']:
-            i = (i + self.INTERVALS[interval]) % 12
-            armoniko_scale.append(self.pitches[i])
-
-        basic = armoniko_scale[0] + 'm'
-        fourth = armoniko_scale[3] + 'm'
-        fifth = armoniko_scale[4]
-        sixth =  armoniko_scale[5]
-
-        chords = f'{basic}, {fourth}, {fifth}, {sixth}'
-
-        return armoniko_scale, chords
-
-
-    def sampax(self):
+    def scale(self, name: str) -> tuple[list[str], str]:
+        """Return the registered scale `name` of the `Scale` objects `tonic` and its chords."""
+        return self._build(SCALES[name.lower()])
+
+    def result(self, name: str) -> 'ScaleResult':
+        """Return the registered scale `name` of the `Scale` objects `tonic` as a compact `ScaleResult`."""
+        definition = SCALES[name.lower()]
+        if self.tuning:
+            return ScaleResult(definition, self.tuning.names,
+                               _step_indices(definition.microtonal or definition.intervals, 2 * self.tonic_index,
+                                             self.edo))
+        table = self._SHARP_TABLE if self.pitches is self.SHARP_PITCHES else self._FLAT_TABLE
+        return ScaleResult(definition, table, _pitch_indices(definition.offsets, self.tonic_index))
+
+    def results(self) -> dict[str, 'ScaleResult']:
+        """Return every registered scale of the `Scale` objects `tonic` as {name: ScaleResult}."""
+        return {definition.name: self.result(definition.name) for definition in SCALES.values()}
+
+    def mask(self, name: str) -> int:
+        """Return the registered scale `name` of the `Scale` objects `tonic` as a pitch-class mask."""
+        return transpose(SCALES[name.lower()].mask, self.tonic_index)
+
+    def chords(self, name: str) -> tuple['Chord', ...]:
+        """Return the chords of the registered scale `name` as `Chord` objects."""
+        definition = SCALES[name.lower()]
         i = self.tonic_index
-        sampax_scale = [self.pitches[i]]
-        for interval in ['M', 'm', 'm', 'A', 'm', 'M', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            sampax_scale.append(self.pitches[i])
-
-        basic = sampax_scale[0] + 'm'
-        third = sampax_scale[2]
-        fifth = sampax_scale[4] + 'm'
-        sixth = sampax_scale[5]
-
-        chords = f'{basic}, {third}, {fifth}, {sixth}'
-
-        return sampax_scale, chords
-
-
-    def xitzaskiar(self):
-        i = self.tonic_index
-        xitzaskiar_scale = [self.pitches[i]]
-        for interval in ['m', 'A', 'm', 'M', 'm', 'A', 'm']:
-            i = (i + self.INTERVALS[interval]) % 12
-            xitzaskiar_scale.append(self.pitches[i])
-
-        basic = xitzaskiar_scale[0]
-        second = xitzaskiar_scale[1]
-        fourth = xitzaskiar_scale[3] + 'm'
-
-        chords = f'{basic}, {second}, {fourth}'
-
-        return xitzaskiar_scale, chords
-
-
-    def niavent(self):
-        i = self.tonic_index
-        niavent_scale = [self.pitches[i]]
-        for interval in ['M', 'm', 'A', 'm', 'm', 'A', 'm']:
-            i = (i + self.INTERVALS[interval]) % 12
-            niavent_scale.append(self.pitches[i])
-
-        basic = niavent_scale[0] + 'm'
-        fifth = niavent_scale[4]
-        sixth = niavent_scale[5]
-
-        chords = f'{basic}, {fifth}, {sixth}'
-
-        return niavent_scale, chords
-
-    def kartsigiar(self):
-        i = self.tonic_index
-        kartsigiar_scale = [self.pitches[i]]
-        for interval in ['M', 'm', 'M', 'm', 'A', 'm', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            kartsigiar_scale.append(self.pitches[i])
-
-        basic = kartsigiar_scale[0] + 'm'
-        second = kartsigiar_scale[1] + 'm'
-        fourth = kartsigiar_scale[3]
-        seventh = kartsigiar_scale[6]
-
-        chords = f'{basic}, {second}, {fourth}, {seventh}'
-
-        return kartsigiar_scale, chords
-
-    def peiraiotikos(self):
-        i = self.tonic_index
-        peiraiotikos_scale = [self.pitches[i]]
-        for interval in ['m', 'A', 'M', 'm', 'm', 'M', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            peiraiotikos_scale.append(self.pitches[i])
-
-        basic = peiraiotikos_scale[0]
-        second = peiraiotikos_scale[1]
-        fourth = peiraiotikos_scale[3]
-
-        chords = f'{basic}, {second}, {fourth}'
-
-        return peiraiotikos_scale, chords
-
-    def poimenikos(self):
-        i = self.tonic_index
-        poimenikos_scale = [self.pitches[i]]
-        for interval in ['M', 'm', 'A', 'm', 'M', 'm', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            poimenikos_scale.append(self.pitches[i])
-
-        basic = poimenikos_scale[0] + 'm'
-        third = poimenikos_scale[2]
-        fifth = poimenikos_scale[4] + 'm'
-
-        chords = f'{basic}, {third}, {fifth}'
-
-        return poimenikos_scale, chords
-
-    def segiax(self):
+        return tuple(Chord((i + definition.offsets[degree - 1]) % 12, quality)
+                     for degree, quality in definition.chords)
+
+    def voicings(self, name: str, seventh: bool = False) -> list[list[str]]:
+        """Return the notes of each chord of the scale `name`, stacked in thirds from the scale.
+
+        Every chord is built on its own scale degree from every other degree of `name`,
+        three notes for a triad or four with `seventh`.
+        """
+        definition = SCALES[name.lower()]
+        scale, _ = self._build(definition)
+        degrees = scale[:-1] if definition.offsets[-1] % 12 == 0 else scale
+        size = 4 if seventh else 3
+        return [[degrees[(degree - 1 + 2 * k) % len(degrees)] for k in range(size)]
+                for degree, _ in definition.chords]
+
+    def _walk(self, intervals):
+        # Sum the intervals in quarter tones and round each note to the nearest EDO step.
+        names, step = self.tuning.names, self.tuning.step
+        position = 2 * self.tonic_index
+        notes = [names[step(position)]]
+        for interval in intervals:
+            position += QUARTER_TONES[interval]
+            notes.append(names[step(position)])
+        return notes
+
+    def _build(self, definition):
+        if self.tuning:
+            scale = self._walk(definition.microtonal or definition.intervals)
+            return scale, definition.chord_format.format(*scale)
         i = self.tonic_index
-        segiax_scale = [self.pitches[i]]
-        for interval in ['A', 'm', 'm', 'M', 'm', 'A', 'm']:
-            i = (i + self.INTERVALS[interval]) % 12
-            segiax_scale.append(self.pitches[i])
+        scale = list(definition.select(self.pitches[i:] + self.pitches[:i]))
+        return scale, definition.chord_format.format(*scale)
 
-        basic = segiax_scale[0]
-        chords = f'{basic}'
+    def validate_tonic(self, tonic: str) -> str:
+        """Return a ValueError if `tonic` is invalid."""
+        if tonic not in self._VALID_TONICS:
+            raise ValueError("Invalid tonic value provided for `Scale` object.")
+        return tonic
 
-        return segiax_scale, chords
+    def validate_intervals(self, intervals: str) -> str:
+        """Raise a ValueError if an invalid interval is supplied in `intervals`."""
+        if self.tuning:
+            if not all(interval in QUARTER_TONES for interval in intervals):
+                raise ValueError("Only intervals 'q', 'm', 'n', 'M', 'N', and 'A' are supported.")
+        elif self._INTERVAL_SET.isdisjoint(intervals):
+            raise ValueError("Only intervals 'm', 'M', and 'A' are supported.")
+        return intervals
 
-    def tampaxaniotikos(self):
-        i = self.tonic_index
-        tampaxaniotikos_scale = [self.pitches[i]]
-        for interval in ['M', 'M', 'm', 'M', 'm', 'A', 'm']:
-            i = (i + self.INTERVALS[interval]) % 12
-            tampaxaniotikos_scale.append(self.pitches[i])
 
-        basic = tampaxaniotikos_scale[0]
-        fourth = tampaxaniotikos_scale[3]
-        fifth = tampaxaniotikos_scale[4]
+    @timed('Scale.scale_all', key=lambda self: self.tonic)
+    def scale_all(self):
+        """Return every scale of the `Scale` objects `tonic` as {name: (scale, chords)}."""
+        if self.tuning:
+            # `TABLE` only holds 12-EDO results.
+            return self._compute_all()
+        return {name: (list(scale), chords) for name, (scale, chords) in TABLE.scales(self.tonic).items()}
 
-        chords = f'{basic}, {fourth}, {fifth}'
+    def _compute_all(self):
+        return {definition.name: self._build(definition) for definition in SCALES.values()}
 
-        return tampaxaniotikos_scale, chords
 
-    def xouzam(self):
-        i = self.tonic_index
-        xouzam_scale = [self.pitches[i]]
-        for interval in ['A', 'm', 'm', 'M', 'M', 'M', 'm']:
-            i = (i + self.INTERVALS[interval]) % 12
-            xouzam_scale.append(self.pitches[i])
+# Pitch classes count semitones up from 'A', matching the order of `Scale.SHARP_PITCHES`.
+# A set of pitch classes is a 12-bit mask with bit `n` set when pitch class `n` is present.
+PITCH_CLASSES = {
+    **{pitch: i for i, pitch in enumerate(Scale.SHARP_PITCHES)},
+    **{pitch: i for i, pitch in enumerate(Scale.FLAT_PITCHES)},
+    'Cb': 2, 'B#': 3, 'Fb': 7, 'E#': 8,
+}
+# Any other name is a letter and up to two accidentals, e.g. 'Ebb' or 'F##'.
+NATURALS = {'A': 0, 'B': 2, 'C': 3, 'D': 5, 'E': 7, 'F': 8, 'G': 10}
+ACCIDENTALS = {-2: 'bb', -1: 'b', 0: '', 1: '#', 2: '##'}
+_ACCIDENTAL_STEPS = {accidental: steps for steps, accidental in ACCIDENTALS.items()}
+FULL_MASK = 0xFFF
 
-        basic = xouzam_scale[0]
-        fourth = xouzam_scale[3]
 
-        chords = f'{basic}, {fourth}'
+def pitch_class(note: str) -> int:
+    """Return the pitch class of the note name `note`, counted in semitones up from 'A'.
 
-        return xouzam_scale, chords
+    Names with double sharps or flats, such as the 'Ebb' of `spelling`, are accepted.
 
-    def xouseini(self):
-        i = self.tonic_index
-        xouseini_scale = [self.pitches[i]]
-        for interval in ['M', 'M', 'm', 'M', 'M', 'm', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            xouseini_scale.append(self.pitches[i])
+    Raises:
+    ------
+    ValueError:
+        If `note` is not a known note name.
+    """
+    try:
+        return PITCH_CLASSES[note.capitalize()]
+    except KeyError:
+        pass
+    try:
+        return (NATURALS[note[:1].upper()] + _ACCIDENTAL_STEPS[note[1:]]) % 12
+    except KeyError:
+        raise ValueError(f"Unknown note name '{note}'.") from None
+
+
+def mask_of(notes) -> int:
+    """Return the pitch-class mask of an iterable of note names."""
+    mask = 0
+    for note in notes:
+        mask |= 1 << pitch_class(note)
+    return mask
+
+
+def mask_of_offsets(offsets) -> int:
+    """Return the pitch-class mask of semitone `offsets` from an 'A' tonic."""
+    mask = 0
+    for offset in offsets:
+        mask |= 1 << offset % 12
+    return mask
+
+
+def transpose(mask: int, semitones: int) -> int:
+    """Return `mask` transposed up by `semitones`, i.e. rotated within its 12 bits."""
+    semitones %= 12
+    return ((mask << semitones) | (mask >> (12 - semitones))) & FULL_MASK
+
+
+def contains(mask: int, notes_mask: int) -> bool:
+    """Return True if every pitch class of `notes_mask` is in `mask`."""
+    return notes_mask & ~mask == 0
+
+
+def mask_notes(mask: int, pitches=Scale.SHARP_PITCHES) -> list[str]:
+    """Return the note names of `mask` from 'A' upwards, spelled with `pitches`."""
+    return [pitches[i] for i in range(12) if mask >> i & 1]
+
+
+CHORD_QUALITIES = {
+    '': (0, 4, 7),
+    'm': (0, 3, 7),
+    'dim': (0, 3, 6),
+    'aug': (0, 4, 8),
+    '7': (0, 4, 7, 10),
+    'maj7': (0, 4, 7, 11),
+    'm7': (0, 3, 7, 10),
+    'm7b5': (0, 3, 6, 10),
+    'dim7': (0, 3, 6, 9),
+    'm6': (0, 3, 7, 9),
+    'mmaj7': (0, 3, 7, 11),
+    '7b5': (0, 4, 6, 10),
+    '7#5': (0, 4, 8, 10),
+    'maj7#5': (0, 4, 8, 11),
+}
+
+
+class Chord(namedtuple('Chord', 'root quality')):
+    """A chord as its `root` pitch class and `quality`, e.g. Chord(5, 'm') for Dm.
+
+    Chords are hashable and compare by value, so they can be cached and indexed.
+    The quality is one of `CHORD_QUALITIES`, with '' for a major triad.
+    """
+    __slots__ = ()
 
-        basic = xouseini_scale[0]
-        second = xouseini_scale[1] + 'm'
-        fifth = xouseini_scale[4] + 'm'
-        sixth = xouseini_scale[5] + 'm'
-        fourth = xouseini_scale[3]
-        seventh = xouseini_scale[6]
+    @classmethod
+    def parse(cls, name: str) -> 'Chord':
+        """Return the `Chord` of a chord name such as 'F#m', 'Bb7' or 'Abb'.
 
-        chords = f'{basic}, {second}, {fifth}, {sixth}, {fourth}, {seventh}'
+        Raises:
+        ------
+        ValueError:
+            If the root or the quality is not recognised.
+        """
+        name = name.strip()
+        # No quality starts with '#' or 'b', so the root takes every accidental.
+        accidental = name[1:3] if name[1:3] in ('##', 'bb') else name[1:2] if name[1:2] in ('#', 'b') else ''
+        root = name[:1 + len(accidental)]
+        quality = name[len(root):]
+        if quality not in CHORD_QUALITIES:
+            raise ValueError(f"Unsupported chord quality in '{name}'.")
+        return cls(pitch_class(root), quality)
 
-        return xouseini_scale, chords
+    def name(self, pitches=Scale.SHARP_PITCHES) -> str:
+        """Return the chord name with its root spelled from `pitches`."""
+        return pitches[self.root] + self.quality
 
-    def rast(self):
-        i = self.tonic_index
-        rast_scale = [self.pitches[i]]
-        for interval in ['M', 'M', 'm', 'M', 'M', 'M', 'm']:
-            i = (i + self.INTERVALS[interval]) % 12
-            rast_scale.append(self.pitches[i])
+    def pitch_classes(self) -> tuple[int, ...]:
+        """Return the pitch classes of the chord tones, root first."""
+        return tuple((self.root + interval) % 12 for interval in CHORD_QUALITIES[self.quality])
 
-        basic = rast_scale[0]
-        fourth = rast_scale[3]
-        fifth = rast_scale[4]
-        second = rast_scale[1]
+    def mask(self) -> int:
+        """Return the pitch-class mask of the chord tones."""
+        return mask_of_offsets(self.root + interval for interval in CHORD_QUALITIES[self.quality])
 
-        chords = f'{basic}, {second}, {fifth}, {fourth}'
 
-        return rast_scale, chords
+# Interval sizes in quarter tones. 'q', 'n' and 'N' (a quarter, three quarters and five
+# quarters of a tone) only exist in resolutions finer than 12-EDO.
+QUARTER_TONES = {'q': 1, 'm': 2, 'n': 3, 'M': 4, 'N': 5, 'A': 6}
 
-    def kiournti(self):
-        i = self.tonic_index
-        kiournti_scale = [self.pitches[i]]
-        for interval in ['M', 'm', 'M', 'M', 'M', 'm', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            kiournti_scale.append(self.pitches[i])
 
-        basic = kiournti_scale[0] + 'm'
-        second = kiournti_scale[1] + 'm'
-        fourth = kiournti_scale[3]
-        third = kiournti_scale[2]
-        seventh = kiournti_scale[6]
-        fifth = kiournti_scale[4] + 'm'
+class EDO:
+    """An equal division of the octave into `divisions` steps, named from a 12-EDO spelling.
 
-        chords = f'{basic}, {second}, {fifth}, {fourth}, {third}, {seventh}'
+    A note `q` quarter tones above 'A' falls on the nearest step, `step(q)`, using integer
+    arithmetic only. Each step is named after the nearest 12-EDO pitch, with one '+' or '-'
+    per step above or below it, e.g. 'E-' for the quarter-flat E of 24-EDO, so a name
+    carries at most `(divisions + 23) // 24` marks: one in 24- and 36-EDO, two in 53-EDO.
 
-        return kiournti_scale, chords
+    Intervals are only written in quarter tones (`QUARTER_TONES`): a finer resolution
+    such as 53-EDO rounds each quarter-tone position to its nearest step and cannot
+    express intervals counted in its own steps, e.g. the 9, 8 and 5 commas of a tetrachord.
 
-    def lokrikos(self):
-        i = self.tonic_index
-        lokrikos_scale = [self.pitches[i]]
-        for interval in ['m', 'M', 'M', 'm', 'M', 'M', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            lokrikos_scale.append(self.pitches[i])
+    Parameters:
+    ----------
+    divisions:
+        The number of steps per octave, at least 12.
+    pitches:
+        The 12 pitch names, starting on 'A', to name the steps from.
+    """
+    _instances = {}
+
+    def __init__(self, divisions: int, pitches):
+        if divisions < 12:
+            raise ValueError("An EDO needs at least 12 steps per octave.")
+        self.divisions = divisions
+        names = []
+        for step in range(divisions):
+            semitone = (24 * step + divisions - 1) // (2 * divisions)
+            # The steps at the top of the octave round up to the 'A' above, `semitone` 12.
+            offset = (step - self.step(2 * semitone) + divisions // 2) % divisions - divisions // 2
+            names.append(pitches[semitone % 12] + ('+' * offset if offset > 0 else '-' * -offset))
+        self.names = tuple(names)
+
+    @classmethod
+    def for_pitches(cls, divisions: int, pitches) -> 'EDO':
+        """Return the shared `EDO` of `divisions` steps named from `pitches`."""
+        key = (divisions, tuple(pitches))
+        try:
+            return cls._instances[key]
+        except KeyError:
+            tuning = cls._instances[key] = cls(divisions, pitches)
+            return tuning
+
+    def step(self, quarter_tones: int) -> int:
+        """Return the step nearest to `quarter_tones` above 'A', wrapped into one octave."""
+        return (quarter_tones * self.divisions + 12) // 24 % self.divisions
+
+
+class ScaleDefinition(namedtuple('ScaleDefinition',
+                                  'name intervals chords offsets mask select chord_format microtonal')):
+    """A registered scale: its display `name`, `intervals` and chords as (degree, quality) pairs.
+
+    `microtonal` is an optional quarter-tone version of `intervals` used by resolutions
+    finer than 12-EDO, or None when the scale sounds the same in every resolution.
+
+    `offsets` holds the semitone distance of every degree from the tonic, `mask` the same
+    degrees as a pitch-class mask on an 'A' tonic, `select` picks those degrees out of a
+    chromatic scale and `chord_format` renders the chords from the picked notes.
+    """
+    __slots__ = ()
 
-        basic = lokrikos_scale[0] + 'm'
-        second = lokrikos_scale[1]
-        fourth = lokrikos_scale[3] + 'm'
-        seventh = lokrikos_scale[6] + 'm'
-        sixth = lokrikos_scale[5]
 
-        chords = f'{basic}, {second}, {fourth}, {sixth}, {seventh}'
+class ScaleResult:
+    """A scale on a tonic held as small indices into a shared table of note names.
 
-        return lokrikos_scale, chords
+    The legacy list of notes and chord string are views computed on access, so holding
+    many results costs one small object each: the `pitches` table is shared by every
+    result spelled alike and the `indices` by every result of the same scale and tonic.
 
-    def ludikos(self):
-        i = self.tonic_index
-        ludikos_scale = [self.pitches[i]]
-        for interval in ['M', 'M', 'M', 'm', 'M', 'M', 'm']:
-            i = (i + self.INTERVALS[interval]) % 12
-            ludikos_scale.append(self.pitches[i])
+    Parameters:
+    ----------
+    definition:
+        The `ScaleDefinition` of the scale.
+    pitches:
+        The tuple of note names that `indices` point into.
+    indices:
+        An `array('B')` of the position of every note of the scale in `pitches`. It is
+        shared, treat it as read-only.
 
-        basic = ludikos_scale[0]
-        fifth = ludikos_scale[4]
-        sixth = ludikos_scale[5]
+    Attributes:
+    ----------
+    name:
+        The display name of the scale.
+    notes:
+        A new list of the note names, as returned by the scale methods of `Scale`.
+    chords:
+        The chords of the scale as a string, as returned by the scale methods of `Scale`.
+    """
+    __slots__ = ('definition', 'pitches', 'indices')
 
-        chords = f'{basic}, {sixth}, {fifth}'
+    def __init__(self, definition: ScaleDefinition, pitches: tuple, indices: array):
+        self.definition = definition
+        self.pitches = pitches
+        self.indices = indices
 
-        return ludikos_scale, chords
+    @property
+    def name(self) -> str:
+        return self.definition.name
 
+    @property
+    def notes(self) -> list[str]:
+        pitches = self.pitches
+        return [pitches[i] for i in self.indices]
 
-    def mixoludikos(self):
-        i = self.tonic_index
-        mixoludikos_scale = [self.pitches[i]]
-        for interval in ['M', 'M', 'm', 'M', 'M', 'm', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            mixoludikos_scale.append(self.pitches[i])
+    @property
+    def chords(self) -> str:
+        return self.definition.chord_format.format(*self.notes)
 
-        basic = mixoludikos_scale[0]
-        second = mixoludikos_scale[1] + 'm'
-        fourth = mixoludikos_scale[3]
-        seventh = mixoludikos_scale[6]
-        sixth = mixoludikos_scale[5] + 'm'
-        fifth = mixoludikos_scale[4] + 'm'
+    def __iter__(self):
+        # Unpack like the (scale, chords) pairs of the scale methods.
+        notes = self.notes
+        yield notes
+        yield self.definition.chord_format.format(*notes)
 
+    def __eq__(self, other):
+        if not isinstance(other, ScaleResult):
+            return NotImplemented
+        return (self.definition is other.definition and self.pitches == other.pitches
+                and self.indices == other.indices)
 
-        chords = f'{basic}, {sixth}, {fifth}, {second}, {fourth}, {seventh}'
+    def __hash__(self):
+        return hash((self.definition.name, self.pitches, self.indices.tobytes()))
 
-        return mixoludikos_scale, chords
+    def __repr__(self):
+        return f"ScaleResult({self.name!r}, {' '.join(self.notes)!r})"
 
-    def ouzal(self):
-        i = self.tonic_index
-        ouzal_scale = [self.pitches[i]]
-        for interval in ['m', 'A', 'm', 'M', 'M', 'm', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            ouzal_scale.append(self.pitches[i])
 
-        basic = ouzal_scale[0]
-        fourth = ouzal_scale[3]
-        seventh = ouzal_scale[6] + 'm'
+@lru_cache(maxsize=None)
+def _pitch_indices(offsets: tuple, root: int) -> array:
+    # The 12-EDO pitch classes of a scale on `root`, shared by every result with them.
+    return array('B', [(root + offset) % 12 for offset in offsets])
 
-        chords = f'{basic}, {fourth}, {seventh}'
-        return ouzal_scale, chords
 
-    def souzinak(self):
-        i = self.tonic_index
-        souzinak_scale = [self.pitches[i]]
-        for interval in ['M', 'm', 'A', 'm', 'm', 'M', 'M']:
-            i = (i + self.INTERVALS[interval]) % 12
-            souzinak_scale.append(self.pitches[i])
+@lru_cache(maxsize=None)
+def _step_indices(intervals: str, position: int, divisions: int) -> array:
+    # The steps of the quarter-tone `intervals` walked up from `position` quarter tones, as in `Scale._walk`.
+    indices = array('B' if divisions <= 256 else 'H', [(position * divisions + 12) // 24 % divisions])
+    for interval in intervals:
+        position += QUARTER_TONES[interval]
+        indices.append((position * divisions + 12) // 24 % divisions)
+    return indices
 
-        basic = souzinak_scale[0] + 'm'
-        third = souzinak_scale[2]
-        fifth = souzinak_scale[4] + 'm'
-        sixth = souzinak_scale[5]
 
-        chords = f'{basic}, {third}, {fifth}, {sixth}'
-        return souzinak_scale, chords
+def load_scales(path=SCALES_FILE) -> dict[str, ScaleDefinition]:
+    """Return the scale registry stored in the JSON file at `path`, keyed by lowercase name.
 
+    Each entry holds a `name`, an `intervals` string of 'm', 'M' and 'A' steps and a list
+    of `chords` as [degree, quality] pairs, with degrees counted from 1 at the tonic. An
+    optional `microtonal` string gives the same number of intervals from `QUARTER_TONES`.
 
-    def validate_tonic(self, tonic: str) -> str:
-        """Return a ValueError if `tonic` is invalid."""
-        if tonic not in self.SHARP_TONES + self.FLAT_TONES:
-            raise ValueError("Invalid tonic value provided for `Scale` object.")
-        return tonic
+    Raises:
+    ------
+    ValueError:
+        If an entry uses an unsupported interval, a chord degree outside the scale or a
+        chord quality missing from `CHORD_QUALITIES`.
+    """
+    with open(path, encoding='utf-8') as file:
+        entries = json.load(file)
+
+    scales = {}
+    for entry in entries:
+        name, intervals = entry['name'], entry['intervals']
+        if not intervals or not all(interval in Scale.INTERVALS for interval in intervals):
+            raise ValueError(f"Scale '{name}' uses an interval other than 'm', 'M' and 'A'.")
+        chords = tuple((degree, quality) for degree, quality in entry['chords'])
+        if not all(1 <= degree <= len(intervals) + 1 for degree, _ in chords):
+            raise ValueError(f"Scale '{name}' has a chord on a degree outside the scale.")
+        unknown = [quality for _, quality in chords if quality not in CHORD_QUALITIES]
+        if unknown:
+            raise ValueError(f"Scale '{name}' has an unknown chord quality '{unknown[0]}'.")
+        offsets = [0]
+        for interval in intervals:
+            offsets.append(offsets[-1] + Scale.INTERVALS[interval])
+        microtonal = entry.get('microtonal')
+        if microtonal is not None and (len(microtonal) != len(intervals)
+                                       or not all(interval in QUARTER_TONES for interval in microtonal)):
+            raise ValueError(f"Scale '{name}' needs {len(intervals)} microtonal intervals from "
+                             f"{', '.join(QUARTER_TONES)}.")
+        chord_format = ', '.join(f'{{{degree - 1}}}' + quality.replace('{', '{{').replace('}', '}}')
+                                 for degree, quality in chords)
+        scales[name.lower()] = ScaleDefinition(name, intervals, chords, tuple(offsets),
+                                               mask_of_offsets(offsets), itemgetter(*(offset % 12 for offset in offsets)), chord_format,
+                                               microtonal)
+    return scales
+
+
+def _scale_method(definition):
+    def method(self):
+        return self._build(definition)
+    method.__name__ = method.__qualname__ = definition.name.lower()
+    method.__doc__ = f"Return the {definition.name} scale of the `Scale` objects `tonic` and its chords."
+    return timed(f'Scale.{method.__name__}', key=lambda self: self.tonic)(method)
+
+
+SCALES = load_scales()
+SCALE_NAMES = tuple(definition.name for definition in SCALES.values())
+
+# Keep `Scale(tonic).major()` and friends working for every registered scale.
+for _definition in SCALES.values():
+    setattr(Scale, _definition.name.lower(), _scale_method(_definition))
+
+
+def tonic_slug(tonic: str) -> str:
+    """Return a file name part for `tonic` that stays unique on case-insensitive file systems."""
+    slug = tonic.capitalize().replace('#', 'sharp')
+    return slug + '-minor' if tonic.islower() else slug
+
+
+def scale_run(tonic: str, name: str) -> list[int]:
+    """Return the semitones above 'A' of the scale `name` played up from `tonic` to its octave and back down."""
+    root = pitch_class(tonic)
+    up = [root + offset for offset in SCALES[name.lower()].offsets]
+    return up + up[-2::-1]
+
+
+def chord_voicings(tonic: str, name: str) -> list[tuple[int, ...]]:
+    """Return the semitones above 'A' of each chord listed for the scale `name`, in root position."""
+    root = pitch_class(tonic)
+    definition = SCALES[name.lower()]
+    return [tuple(root + definition.offsets[degree - 1] + interval for interval in CHORD_QUALITIES[quality])
+            for degree, quality in definition.chords]
+
+
+class ScaleTable:
+    """Every `Scale` result for every valid tonic, computed once.
 
-    def validate_intervals(self, intervals: str) -> str:
-        """Raise a ValueError if an invalid interval is supplied in `intervals`."""
-        if not any(i in self.INTERVALS for i in intervals):
-            raise ValueError("Only intervals 'm', 'M', and 'A' are supported.")
-        return intervals
+    Parameters:
+    ----------
+    tonics:
+        An iterable of tonic strings to precompute. Tonics that `Scale` rejects are skipped.
 
+    Attributes:
+    ----------
+    tonics:
+        A tuple of the precomputed tonics, in the given order.
 
-    def scale_all(self):
-        scales = {
-            'Major': self.major(),
-            'Minor': self.minor(),
-            'Ousak': self.ousak(),
-            'Xitzaz': self.xitzaz(),
-            'Armoniko': self.armoniko(),
-            'Sampax': self.sampax(),
-            'Xitzaskiar': self.xitzaskiar(),
-            'Niavent': self.niavent(),
-            'Kartsigiar': self.kartsigiar(),
-            'Peiraiotikos': self.peiraiotikos(),
-            'Poimenikos': self.poimenikos(),
-            'Segiax': self.segiax(),
-            'Tampaxaniotikos': self.tampaxaniotikos(),
-            'Xouzam': self.xouzam(),
-            'Xouseini': self.xouseini(),
-            'Rast': self.rast(),
-            'Kiournti': self.kiournti(),
-            'Lokrikos': self.lokrikos(),
-            'Ludikos': self.ludikos(),
-            'Mixoludikos': self.mixoludikos(),
-            'Ouzal': self.ouzal(),
-            'Souzinak': self.souzinak(),
-        }
-
-        return scales
+    Functions:
+    ---------
+    scales(tonic: str) -> Mapping[str, tuple[tuple[str, ...], str]]:
+        Return the read-only {name: (scale, chords)} mapping for `tonic`.
+    get(tonic: str, scale_name: str) -> tuple[tuple[str, ...], str]:
+        Return the (scale, chords) pair for `tonic` and `scale_name`.
+    """
 
+    def __init__(self, tonics):
+        self._scales = {}
+        for tonic in tonics:
+            try:
+                scale = Scale.for_tonic(tonic)
+            except ValueError:
+                continue
+            self._scales[tonic] = MappingProxyType(
+                {name: (tuple(notes), chords) for name, (notes, chords) in scale._compute_all().items()})
+        self.tonics = tuple(self._scales)
+
+    def scales(self, tonic: str):
+        """Return the read-only {name: (scale, chords)} mapping for `tonic`."""
+        try:
+            return self._scales[tonic]
+        except KeyError:
+            raise ValueError("Invalid tonic value provided for `Scale` object.") from None
+
+    def get(self, tonic: str, scale_name: str):
+        """Return the (scale, chords) pair for `tonic` and `scale_name`."""
+        return self.scales(tonic)[SCALES[scale_name.lower()].name]
+
+
+TABLE = ScaleTable(Scale.SHARP_TONES + Scale.FLAT_TONES)
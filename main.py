@@ -1,15 +1,26 @@
 import tkinter as tk
 from tkinter import scrolledtext
-from keys import Scale  # Assuming Scale class is defined in keys.py
-import examples
-import songs
-import re
+from concurrent.futures import ThreadPoolExecutor
+from snapshot import views
+from songdb import open_songs
+from profiling import timed
+
+POLL_MS = 10  # How often the mainloop checks for a finished background render
+
+
 class ScaleApp:
     def __init__(self, root):
         self.root = root
         root.title("Scale Generator App")
         root.configure(bg='#a888d1')  # Dark background color
         self.selected_key = None  # Variable to store the selected key
+        self.selected_scale = None  # Variable to store the last displayed scale
+        self.songs = open_songs()  # SQLite song database if built, else the JSON catalog
+        self.views = views()  # Prebuilt snapshot if it is up to date, else the renderers in sheets
+        self.instrument = self.views.default_instrument()  # Instrument whose fretboard is displayed
+        self.executor = ThreadPoolExecutor(max_workers=1)  # Renders views off the Tk mainloop
+        self.pending = {}  # Latest background render per display slot
+        self.shown_text = {}  # Text currently shown by each text widget
         self.create_widgets()
 
     def create_widgets(self):
@@ -67,9 +78,7 @@ class ScaleApp:
 
     def create_key_buttons(self, frame):
         # Create buttons for each key to generate scales
-        keys = ['A', 'Bb', 'B', 'C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab']
-
-        for i, key in enumerate(keys):
+        for i, key in enumerate(self.views.key_tonics()):
             button_text = f'Generate {key} Scales'
             button = tk.Button(frame, text=button_text, command=lambda k=key: self.set_selected_key(k),
                                highlightthickness=0, font=('Comic Sans MS', 12), bg='#d4aa00', fg='#1e1e1e')
@@ -77,12 +86,7 @@ class ScaleApp:
 
     def create_scale_buttons(self, frame):
         # Create buttons for each scale to display on the fretboard
-        scales = ["Major", "Minor", "Ousak", "Xitzaz", "Armoniko", "Sampax", "Xitzaskiar",
-                  "Niavent", "Kartsigiar", "Peiraiotikos", "Poimenikos", "Segiax",
-                  "Tampaxaniotikos", "Xouzam", "Xouseini", "Rast", "Kiournti",
-                  "Lokrikos", "Ludikos", "Mixoludikos", "Ouzal", "Souzinak"]
-
-        for i, scale_name in enumerate(scales):
+        for i, scale_name in enumerate(self.views.scale_names()):
             button = tk.Button(frame, text=scale_name, command=lambda s=scale_name: self.display_scale(s),
                                bg='#1e1e1e', fg='#61dafb')
             button.grid(row=i // 5, column=i % 5, pady=5, padx=10)
@@ -93,10 +97,27 @@ class ScaleApp:
                                                          bg='black', fg='white')
         self.songs_text_area.pack(side=tk.LEFT, expand=True, fill='both')
     def setup_fretboard_display(self, frame):
+        # Set up the instrument selector above the fretboard
+        instrument_names = {name: key for key, name in self.views.instrument_names().items()}
+        self.instrument_var = tk.StringVar(value=self.views.instrument_names()[self.instrument])
+        instrument_menu = tk.OptionMenu(frame, self.instrument_var, *instrument_names,
+                                        command=lambda name: self.set_instrument(instrument_names[name]))
+        instrument_menu.configure(bg='#1e1e1e', fg='#61dafb', highlightthickness=0)
+        instrument_menu.pack(anchor='w')
+
         # Set up fretboard display
-        self.fretboard_label = tk.Label(frame, text=examples.fretboard, font=('Courier New', 20), bg='black', fg='white', justify='left', anchor='w')
+        self.fretboard_label = tk.Label(frame, text=self.views.fretboard_text(self.instrument), font=('Courier New', 20), bg='black', fg='white', justify='left', anchor='w')
         self.fretboard_label.pack(expand=True, fill='both')
 
+    def set_instrument(self, instrument):
+        # Switch to a cached fretboard layout and redraw the selected scale on it
+        self.instrument = instrument
+        if self.selected_scale:
+            self.display_scale(self.selected_scale)
+        else:
+            self.fretboard_label.config(text=self.views.fretboard_text(instrument))
+
+    @timed('ScaleApp.set_selected_key', key=lambda self, key: key)
     def set_selected_key(self, key):
         # Function to set the selected key when "Generate A Scales" button is pressed
         self.selected_key = key
@@ -104,135 +125,63 @@ class ScaleApp:
 
     def display_scales(self, key):
         if self.selected_key:
-            scale_instance = Scale(self.selected_key)
-
-            major_scale, major_chords = scale_instance.major()
-            minor_scale, minor_chords = scale_instance.minor()
-            ousak_scale, ousak_chords = scale_instance.ousak()
-            xitzaz_scale, xitzaz_chords = scale_instance.xitzaz()
-            armoniko_scale, armoniko_chords = scale_instance.armoniko()
-            sampax_scale, sampax_chords = scale_instance.sampax()
-            xitzaskiar_scale, xitzaskiar_chords = scale_instance.xitzaskiar()
-            niavent_scale, niavent_chords = scale_instance.niavent()
-            kartsigiar_scale, kartsigiar_chords = scale_instance.kartsigiar()
-            peiraiotikos_scale, peiraiotikos_chords = scale_instance.peiraiotikos()
-            poimenikos_scale, poimenikos_chords = scale_instance.poimenikos()
-            segiax_scale, segiax_chords = scale_instance.segiax()
-            tampaxaniotikos_scale, tampaxaniotikos_chords = scale_instance.tampaxaniotikos()
-            xouzam_scale, xouzam_chords = scale_instance.xouzam()
-            xouseini_scale, xouseini_chords = scale_instance.xouseini()
-            rast_scale, rast_chords = scale_instance.rast()
-            kiournti_scale, kiournti_chords = scale_instance.kiournti()
-            lokrikos_scale, lokrikos_chords = scale_instance.lokrikos()
-            ludikos_scale, ludikos_chords = scale_instance.ludikos()
-            mixoludikos_scale, mixoludikos_chords = scale_instance.mixoludikos()
-            ouzal_scale, ouzal_chords = scale_instance.ouzal()
-            souzinak_scale, souzinak_chords = scale_instance.souzinak()
-
-            result_text = f'{key} Major Scale: {" ".join(major_scale)}\n'
-            result_text += f'Major Chords: {major_chords}\n\n'
-            result_text += f'{key} Minor Scale: {" ".join(minor_scale)}\n'
-            result_text += f'Minor Chords: {minor_chords}\n\n'
-            result_text += f'{key} Ousak Scale: {" ".join(ousak_scale)}\n'
-            result_text += f'Ousak Chords: {ousak_chords}\n\n'
-            result_text += f'{key} Xitzaz Scale: {" ".join(xitzaz_scale)}\n'
-            result_text += f'Xitzaz Chords: {xitzaz_chords}\n\n'
-            result_text += f'{key} Armoniko Scale: {" ".join(armoniko_scale)}\n'
-            result_text += f'Armoniko Chords: {armoniko_chords}\n\n'
-            result_text += f'{key} Sampax Scale: {" ".join(sampax_scale)}\n'
-            result_text += f'Sampax Chords: {sampax_chords}\n\n'
-            result_text += f'{key} Xitzaskiar Scale: {" ".join(xitzaskiar_scale)}\n'
-            result_text += f'Xitzaskiar Chords: {xitzaskiar_chords}\n\n'
-            result_text += f'{key} Niavent Scale: {" ".join(niavent_scale)}\n'
-            result_text += f'Niavent Chords: {niavent_chords}\n\n'
-            result_text += f'{key} Kartsigiar Scale: {" ".join(kartsigiar_scale)}\n'
-            result_text += f'Kartsigiar Chords: {kartsigiar_chords}\n\n'
-            result_text += f'{key} Peiraiotikos Scale: {" ".join(peiraiotikos_scale)}\n'
-            result_text += f'Peiraiotikos Chords: {peiraiotikos_chords}\n\n'
-            result_text += f'{key} Poimenikos Scale: {" ".join(poimenikos_scale)}\n'
-            result_text += f'Poimenikos Chords: {poimenikos_chords}\n\n'
-            result_text += f'{key} Segiax Scale: {" ".join(segiax_scale)}\n'
-            result_text += f'Segiax Chords: {segiax_chords}\n\n'
-            result_text += f'{key} Tampaxaniotikos Scale: {" ".join(tampaxaniotikos_scale)}\n'
-            result_text += f'Tampaxaniotikos Chords: {tampaxaniotikos_chords}\n\n'
-            result_text += f'{key} Xouzam Scale: {" ".join(xouzam_scale)}\n'
-            result_text += f'Xouzam Chords: {xouzam_chords}\n\n'
-            result_text += f'{key} Xouseini Scale: {" ".join(xouseini_scale)}\n'
-            result_text += f'Xouseini Chords: {xouseini_chords}\n\n'
-            result_text += f'{key} Rast Scale: {" ".join(rast_scale)}\n'
-            result_text += f'Rast Chords: {rast_chords}\n\n'
-            result_text += f'{key} Kiournti Scale: {" ".join(kiournti_scale)}\n'
-            result_text += f'Kiournti Chords: {kiournti_chords}\n\n'
-            result_text += f'{key} Lokrikos Scale: {" ".join(lokrikos_scale)}\n'
-            result_text += f'Lokrikos Chords: {lokrikos_chords}\n\n'
-            result_text += f'{key} Ludikos Scale: {" ".join(ludikos_scale)}\n'
-            result_text += f'Ludikos Chords: {ludikos_chords}\n\n'
-            result_text += f'{key} Mixoludikos Scale: {" ".join(mixoludikos_scale)}\n'
-            result_text += f'Mixoludikos Chords: {mixoludikos_chords}\n\n'
-            result_text += f'{key} Ouzal Scale: {" ".join(ouzal_scale)}\n'
-            result_text += f'Ouzal Chords: {ouzal_chords}\n\n'
-            result_text += f'{key} Souzinak Scale: {" ".join(souzinak_scale)}\n'
-            result_text += f'Souzinak Chords: {souzinak_chords}\n'
-
-            self.text_area.delete(1.0, tk.END)  # Clear previous text
-            self.text_area.insert(tk.END, result_text)
-
-            self.text_area.tag_add('center', '1.0', 'end')
-            self.text_area.tag_configure('center', justify='center')
+            self.run_in_background('scales', self.views.scales_text, (self.selected_key,), self.show_scales)
+
+    def show_scales(self, result_text):
+        self.update_text(self.text_area, result_text)
+        self.text_area.tag_add('center', '1.0', 'end')
+        self.text_area.tag_configure('center', justify='center')
 
+    @timed('ScaleApp.display_scale', key=lambda self, scale_name: f'{self.selected_key} {scale_name}')
     def display_scale(self, scale_name):
         if self.selected_key:
-            lowercase_scale_name = scale_name.lower()
-
-            # Assuming you have an instance of the Scale class called scale_instance
-            scale_instance = Scale(self.selected_key)
-
-            # Use getattr to dynamically call the method
-            scale_tuple = getattr(scale_instance, lowercase_scale_name)()
-
-            # The scale_tuple would contain the scale name, scale, and chords
-            scale, chords = scale_tuple
-
-            tragoudeta = songs.tragoudia.get(lowercase_scale_name, [])
-            songs_text = f"Songs for {scale_name} scale:\n\n" + '\n'.join(tragoudeta)
-            self.songs_text_area.delete(1.0, tk.END)  # Clear previous text
-            self.songs_text_area.insert(tk.END, songs_text)
-            self.songs_text_area.tag_add('center', '1.0', 'end')
-            self.songs_text_area.tag_configure('center', justify='center')
-
-            # Display information on top of the fretboard
-            info_text = '------------------------------------------------------\n'
-            info_text += f"Selected Key: {self.selected_key}\n"
-            info_text += f"Scale Name: {scale_name}\n"
-            info_text += f"Scale: {scale}\n"
-            info_text += f"Chords: {chords}\n"
-            info_text += '------------------------------------------------------\n'
-
-            # Update the information on top of the fretboard with centered text
-            self.fretboard_label.config(text=info_text, justify='center', anchor='center', fg='white')
-
-            all_notes = ['A', 'A#', 'Bb', 'B', 'C', 'C#', 'Db', 'D', 'D#', 'Eb', 'E', 'F', 'F#', 'Gb', 'G', 'G#', 'Ab']
-            rest_of_notes = []
-
-            for note in all_notes:
-                if note not in scale:
-                    rest_of_notes.append(note)
-
-            print(rest_of_notes)
-
-            modified_fretboard = examples.fretboard
-
-            for note in rest_of_notes:
-                if len(note) == 1:
-                    modified_fretboard = re.sub(fr'(?:(?<=\s)|(?<=^)){re.escape(note)}(?:(?=\s)|(?=\n)|(?=$))', '-',
-                                                modified_fretboard)
-                else:
-                    modified_fretboard = re.sub(fr'(?:(?<=\s)|(?<=^)){re.escape(note)}(?:(?=\s)|(?=\n)|(?=$))', '- ',
-                                                modified_fretboard)
-
-            print(modified_fretboard)
-
-            self.fretboard_label.config(text=info_text + "\n" + modified_fretboard)
+            self.selected_scale = scale_name
+            self.run_in_background('scale', self.views.scale_view,
+                                   (self.selected_key, scale_name, self.instrument, self.songs), self.show_scale)
+
+    def show_scale(self, view):
+        songs_text, sheet = view
+        self.update_text(self.songs_text_area, songs_text)
+        self.songs_text_area.tag_add('center', '1.0', 'end')
+        self.songs_text_area.tag_configure('center', justify='center')
+
+        # Update the information and fretboard with centered text, only if it changed
+        if self.fretboard_label.cget('text') != sheet:
+            self.fretboard_label.config(text=sheet, justify='center', anchor='center', fg='white')
+
+    def run_in_background(self, slot, func, args, apply):
+        # Render on the worker thread and hand the result back to the Tk mainloop through
+        # root.after polling; a newer request for the same slot supersedes an older one
+        future = self.executor.submit(func, *args)
+        self.pending[slot] = future
+        self.root.after(POLL_MS, self.poll, slot, future, apply)
+
+    def poll(self, slot, future, apply):
+        if self.pending.get(slot) is not future:
+            return
+        if not future.done():
+            self.root.after(POLL_MS, self.poll, slot, future, apply)
+            return
+        del self.pending[slot]
+        apply(future.result())
+
+    def update_text(self, widget, text):
+        # Replace only the lines between the unchanged head and tail of the widget text
+        old_lines = self.shown_text.get(widget, '').splitlines(keepends=True)
+        new_lines = text.splitlines(keepends=True)
+        if old_lines == new_lines:
+            return
+        limit = min(len(old_lines), len(new_lines))
+        head = 0
+        while head < limit and old_lines[head] == new_lines[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old_lines[-1 - tail] == new_lines[-1 - tail]:
+            tail += 1
+        end_index = f'{len(old_lines) - tail + 1}.0' if tail else 'end-1c'
+        widget.delete(f'{head + 1}.0', end_index)
+        widget.insert(f'{head + 1}.0', ''.join(new_lines[head:len(new_lines) - tail]))
+        self.shown_text[widget] = text
 
 
 if __name__ == "__main__":
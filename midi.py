@@ -0,0 +1,230 @@
+"""Standard MIDI Files: export scales and chords, and find the dromos of MIDI songs.
+
+Only the standard library is used. Files are read through `mmap` and parsed event by
+event from `memoryview` slices of the track chunks, so a song is never copied or
+decoded into a list of events. Run ``python -m midi --help`` for the commands.
+"""
+import argparse
+import mmap
+import os
+import sys
+from typing import NamedTuple
+
+import identify
+from keys import SCALE_NAMES, SCALES, TABLE, chord_voicings, scale_run, tonic_slug
+
+TICKS_PER_BEAT = 480
+TEMPO = 500_000  # microseconds per beat, 120 BPM
+# MIDI note number of the 'A' that the `keys` semitones count from (A3).
+BASE_NOTE = 57
+VELOCITY = 80
+# General MIDI plays channel 10 (9 counting from 0) as drums, which carry no pitch.
+DRUM_CHANNEL = 9
+
+
+class Note(NamedTuple):
+    """A note on or off event; a note off has velocity 0."""
+    track: int
+    tick: int
+    channel: int
+    note: int
+    velocity: int
+
+
+def variable_length(value: int) -> bytes:
+    """Return `value` as a MIDI variable-length quantity."""
+    data = bytearray([value & 0x7F])
+    value >>= 7
+    while value:
+        data.append(0x80 | value & 0x7F)
+        value >>= 7
+    return bytes(reversed(data))
+
+
+def smf(events, ticks_per_beat: int = TICKS_PER_BEAT, tempo: int = TEMPO) -> bytes:
+    """Return a format 0 Standard MIDI File of `events`, (tick, status, data bytes) in any order."""
+    track = bytearray(b'\x00\xff\x51\x03' + tempo.to_bytes(3, 'big'))
+    last = 0
+    # Note offs sort before note ons on the same tick, so repeated notes restart cleanly.
+    for tick, status, data in sorted(events, key=lambda event: (event[0], event[1] & 0xF0 != 0x80)):
+        track += variable_length(tick - last)
+        track.append(status)
+        track += data
+        last = tick
+    track += b'\x00\xff\x2f\x00'
+    return (b'MThd' + (6).to_bytes(4, 'big') + (0).to_bytes(2, 'big') + (1).to_bytes(2, 'big')
+            + ticks_per_beat.to_bytes(2, 'big') + b'MTrk' + len(track).to_bytes(4, 'big') + bytes(track))
+
+
+def _sounding(chords, beats: float, ticks_per_beat: int, channel: int):
+    # Yield the note on and off events of `chords` (tuples of semitones), one after another.
+    length = int(beats * ticks_per_beat)
+    for i, chord in enumerate(chords):
+        for semitone in chord:
+            note = BASE_NOTE + semitone
+            yield i * length, 0x90 | channel, bytes((note, VELOCITY))
+            yield (i + 1) * length, 0x80 | channel, bytes((note, 0))
+
+
+def scale_midi(tonic: str, scale_name: str, chords: bool = False, ticks_per_beat: int = TICKS_PER_BEAT) -> bytes:
+    """Return a MIDI file of a scale played up and down, or of its chords with `chords`."""
+    if chords:
+        events = _sounding(chord_voicings(tonic, scale_name), 2, ticks_per_beat, 0)
+    else:
+        events = _sounding([(semitone,) for semitone in scale_run(tonic, scale_name)], 0.5, ticks_per_beat, 0)
+    return smf(events, ticks_per_beat)
+
+
+def _read_variable_length(view, i: int) -> tuple[int, int]:
+    value = 0
+    while True:
+        byte = view[i]
+        i += 1
+        value = value << 7 | byte & 0x7F
+        if byte < 0x80:
+            return value, i
+
+
+def chunks(data):
+    """Yield the (type, memoryview) of every chunk of the MIDI file `data`, without copying.
+
+    Raises:
+    ------
+    ValueError:
+        If a chunk is longer than the data left.
+    """
+    view = memoryview(data)
+    i = 0
+    while i + 8 <= len(view):
+        size = int.from_bytes(view[i + 4:i + 8], 'big')
+        if i + 8 + size > len(view):
+            raise ValueError(f'{bytes(view[i:i + 4])!r} chunk of {size} bytes is truncated')
+        yield bytes(view[i:i + 4]), view[i + 8:i + 8 + size]
+        i += 8 + size
+
+
+def notes(data):
+    """Yield a `Note` for every note on and note off of the MIDI file `data`, track by track.
+
+    Running status is honoured; meta, system exclusive and other channel events are
+    stepped over without decoding their contents.
+
+    Raises:
+    ------
+    ValueError:
+        If a chunk is truncated or a track ends in the middle of an event.
+    """
+    track = -1
+    for kind, chunk in chunks(data):
+        if kind != b'MTrk':
+            continue
+        track += 1
+        tick = i = status = 0
+        end = len(chunk)
+        try:
+            while i < end:
+                delta, i = _read_variable_length(chunk, i)
+                tick += delta
+                if chunk[i] & 0x80:
+                    status = chunk[i]
+                    i += 1
+                if status == 0xFF:
+                    length, i = _read_variable_length(chunk, i + 1)
+                    i += length
+                    status = 0
+                elif status in (0xF0, 0xF7):
+                    length, i = _read_variable_length(chunk, i)
+                    i += length
+                    status = 0
+                else:
+                    message = status & 0xF0
+                    if message in (0x80, 0x90):
+                        velocity = chunk[i + 1] if message == 0x90 else 0
+                        yield Note(track, tick, status & 0x0F, chunk[i], velocity)
+                        i += 2
+                    elif message in (0xC0, 0xD0):
+                        i += 1
+                    else:
+                        i += 2
+        except IndexError:
+            raise ValueError(f'track {track} ends in the middle of an event') from None
+
+
+def pitch_class_weights(data) -> list[int]:
+    """Return the sounding time in ticks of every pitch class ('A' first) in the MIDI file `data`.
+
+    Drums are left out and a note still sounding at the end of its track is not counted.
+    """
+    weights = [0] * 12
+    started = {}
+    for note in notes(data):
+        if note.channel == DRUM_CHANNEL:
+            continue
+        key = (note.track, note.channel, note.note)
+        if note.velocity:
+            started.setdefault(key, note.tick)
+        else:
+            start = started.pop(key, None)
+            if start is not None:
+                weights[(note.note - BASE_NOTE) % 12] += note.tick - start
+    return weights
+
+
+def analyze(path, limit: int = 3) -> list[identify.Fit]:
+    """Return the scales best matching the MIDI file at `path`, best first.
+
+    Raises:
+    ------
+    ValueError:
+        If the file is not a well-formed MIDI file.
+    """
+    if not os.path.getsize(path):
+        return []
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        try:
+            weights, error = pitch_class_weights(data), None
+        except ValueError as exc:
+            # The traceback holds views of the map, which cannot be closed until it is dropped.
+            weights, error = None, str(exc)
+    if error is not None:
+        raise ValueError(f"'{path}' is not a valid MIDI file: {error}.")
+    return identify.fit(weights, limit)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m midi', description='Export scales to and analyze MIDI files.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='write a scale or its chords as a MIDI file')
+    export.add_argument('tonic', help='tonic of the scale')
+    export.add_argument('scale', help='name of the scale')
+    export.add_argument('-c', '--chords', action='store_true', help='play the chords instead of the scale')
+    export.add_argument('-o', '--output', metavar='FILE', help='file to write (default: TONIC-SCALE.mid)')
+    analyze_parser = commands.add_parser('analyze', help='print the dromos of MIDI files')
+    analyze_parser.add_argument('paths', nargs='+', metavar='FILE', help='MIDI files to analyze')
+    args = parser.parse_args(argv)
+
+    if args.command == 'export':
+        if args.scale.lower() not in SCALES:
+            parser.error(f"unknown scale '{args.scale}', choose from {', '.join(SCALE_NAMES)}")
+        if args.tonic not in TABLE.tonics:
+            parser.error(f"invalid tonic '{args.tonic}'")
+        path = args.output or f'{tonic_slug(args.tonic)}-{SCALES[args.scale.lower()].name}.mid'
+        with open(path, 'wb') as file:
+            file.write(scale_midi(args.tonic, args.scale, args.chords))
+        print(f'wrote {path}')
+        return 0
+
+    status = 0
+    for path in args.paths:
+        try:
+            fits = analyze(path)
+        except ValueError as error:
+            print(error, file=sys.stderr)
+            status = 1
+            continue
+        print(f'{path}: ' + (', '.join(f'{fit.tonic} {fit.scale} ({fit.score:.2f})' for fit in fits) or '-'))
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
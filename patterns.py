@@ -0,0 +1,197 @@
+"""Pattern search: the scales that contain an interval fragment, such as a tetrachord.
+
+Each scale is a cyclic sequence of intervals, so a fragment may start on any degree
+and run past the octave, the way the m-A-m of Xitzaz also sits inside Ouzal. Every
+n-gram of every rotation is indexed once, with its scale and starting degree; a query
+looks up its rarest n-gram and only checks the scales listed for it, instead of
+scanning every interval pattern of the registry. Run ``python -m patterns FRAGMENT``
+to print the matches.
+"""
+import argparse
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+import keys
+import spelling
+
+# Longest n-gram indexed, 4 intervals to look up tetrachords and pentachords whole.
+# Longer fragments are looked up by their rarest n-gram.
+GRAM = 4
+
+
+class Occurrence(NamedTuple):
+    """A fragment in a scale: the `degree` it starts on, counted from 1, and that degree's `offset`."""
+    scale: str
+    degree: int
+    offset: int
+
+
+class Placement(NamedTuple):
+    """A fragment in a scale on `tonic`, starting on the note `start` of the scale's `degree`."""
+    tonic: str
+    scale: str
+    degree: int
+    start: str
+
+
+def parse_fragment(fragment: str) -> str:
+    """Return `fragment` as a string of intervals, accepting e.g. 'mAm', 'm-A-m' or 'm A m'.
+
+    Raises:
+    ------
+    ValueError:
+        If `fragment` is empty or uses an interval other than 'm', 'M' and 'A'.
+    """
+    intervals = fragment.replace('-', '').replace(' ', '')
+    if not intervals or not all(interval in keys.Scale.INTERVALS for interval in intervals):
+        raise ValueError(f"Fragment '{fragment}' must be one or more of the intervals 'm', 'M' and 'A'.")
+    return intervals
+
+
+class PatternIndex:
+    """An n-gram index over the cyclic interval sequences of a scale registry.
+
+    Parameters:
+    ----------
+    scales:
+        The scale registry to index, defaults to `keys.SCALES`.
+    gram:
+        The longest n-gram to index, defaults to `GRAM`.
+
+    Functions:
+    ---------
+    find(fragment: str) -> list[Occurrence]:
+        Return every occurrence of the interval `fragment` in the registry.
+    transpositions(fragment: str, tonics) -> list[Placement]:
+        Return every occurrence of `fragment` in every scale on each of `tonics`.
+    shared(scale_name: str, length: int) -> dict[str, list[Occurrence]]:
+        Return the other scales containing each `length`-interval fragment of `scale_name`.
+    """
+
+    def __init__(self, scales=keys.SCALES, gram: int = GRAM):
+        self.gram = gram
+        self._names = []
+        self._ids = {}
+        self._intervals = []
+        # Every sequence followed by itself, so every rotation is a plain slice.
+        self._cycles = []
+        self._offsets = []
+        # n-gram: [(scale id, position), ...] for every n from 1 to `gram`.
+        postings = defaultdict(list)
+        for definition in scales.values():
+            intervals = definition.intervals
+            i = self._ids[definition.name.lower()] = len(self._names)
+            self._names.append(definition.name)
+            self._intervals.append(intervals)
+            cycle = intervals + intervals
+            self._cycles.append(cycle)
+            offsets = [0]
+            for interval in intervals[:-1]:
+                offsets.append(offsets[-1] + keys.Scale.INTERVALS[interval])
+            self._offsets.append(tuple(offsets))
+            for position in range(len(intervals)):
+                for n in range(1, min(gram, len(intervals)) + 1):
+                    postings[cycle[position:position + n]].append((i, position))
+        self._postings = dict(postings)
+
+    def __len__(self):
+        return len(self._names)
+
+    def _find(self, intervals: str):
+        # Return the (scale id, position) of every occurrence of the parsed `intervals`, in order.
+        if len(intervals) <= self.gram:
+            return self._postings.get(intervals, [])
+        grams = [intervals[k:k + self.gram] for k in range(len(intervals) - self.gram + 1)]
+        k = min(range(len(grams)), key=lambda k: len(self._postings.get(grams[k], ())))
+        cycles = self._cycles
+        found = []
+        for i, position in self._postings.get(grams[k], ()):
+            length = len(cycles[i]) // 2
+            if len(intervals) > length:
+                continue
+            start = (position - k) % length
+            if cycles[i].startswith(intervals, start):
+                found.append((i, start))
+        # Postings are in scale and position order, but a match found by a later n-gram
+        # can start before an earlier one, past the octave.
+        found.sort()
+        return found
+
+    def find(self, fragment: str) -> list[Occurrence]:
+        """Return every occurrence of the interval `fragment` in the registry, in registry order."""
+        return [Occurrence(self._names[i], position + 1, self._offsets[i][position])
+                for i, position in self._find(parse_fragment(fragment))]
+
+    def transpositions(self, fragment: str, tonics=keys.TONICS) -> list[Placement]:
+        """Return every occurrence of `fragment` in every scale on each of `tonics`.
+
+        The starting note is spelled as in `spelling`, one letter per degree.
+        """
+        occurrences = self._find(parse_fragment(fragment))
+        placements = []
+        for tonic in tonics:
+            for i, position in occurrences:
+                notes = spelling.spell_pattern(self._intervals[i], tonic)
+                placements.append(Placement(tonic, self._names[i], position + 1, notes[position]))
+        return placements
+
+    def shared(self, scale_name: str, length: int = 4) -> dict[str, list[Occurrence]]:
+        """Return the other scales containing each `length`-interval fragment of the scale `scale_name`.
+
+        A tetrachord spans 3 intervals and a pentachord 4. Fragments are keyed by their
+        intervals and listed in the order they appear from the tonic up.
+        """
+        try:
+            i = self._ids[scale_name.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown scale '{scale_name}'.") from None
+        intervals, cycle = self._intervals[i], self._cycles[i]
+        shared = {}
+        if length > len(intervals):
+            return shared
+        for position in range(len(intervals)):
+            fragment = cycle[position:position + length]
+            if fragment not in shared:
+                shared[fragment] = [occurrence for occurrence in self.find(fragment)
+                                    if occurrence.scale != self._names[i]]
+        return shared
+
+
+INDEX = PatternIndex()
+
+
+def find(fragment: str) -> list[Occurrence]:
+    """Return every occurrence of the interval `fragment` in the catalog scales."""
+    return INDEX.find(fragment)
+
+
+def transpositions(fragment: str, tonics=keys.TONICS) -> list[Placement]:
+    """Return every occurrence of `fragment` in the catalog scales on each of `tonics`."""
+    return INDEX.transpositions(fragment, tonics)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m patterns',
+                                     description='Print the scales containing an interval fragment.')
+    parser.add_argument('fragment', help="intervals of the fragment, e.g. 'mAm' or 'M-M-m-M'")
+    parser.add_argument('--on', metavar='NOTE', help='only list the scales where the fragment starts on NOTE')
+    args = parser.parse_args(argv)
+    try:
+        occurrences = find(args.fragment)
+        start = None if args.on is None else keys.pitch_class(args.on)
+    except ValueError as error:
+        parser.error(str(error))
+
+    for occurrence in occurrences:
+        if start is None:
+            print(f'{occurrence.scale:<20} degree {occurrence.degree}')
+        else:
+            # `keys.TONICS` has one tonic per pitch class, 'A' first.
+            tonic = keys.TONICS[(start - occurrence.offset) % 12]
+            print(f'{tonic:<3} {occurrence.scale:<20} degree {occurrence.degree}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
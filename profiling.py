@@ -0,0 +1,147 @@
+"""Opt-in timing of the hot paths.
+
+Set the SCALES_PROFILE environment variable to a file name before starting the app,
+the CLI or a script, and every call through a function decorated with `timed` is
+timed and counted. Each timing keeps its count, total and maximum and a fixed-size
+random sample of durations for the percentiles, so a long-running process profiles
+in constant memory. The aggregated timings are written to that file as JSON at exit,
+and ``python -m profiling FILE`` prints them. Without SCALES_PROFILE, `timed` returns
+the functions undecorated, so the instrumentation costs nothing.
+"""
+import atexit
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from functools import wraps
+
+PROFILE_FILE = os.environ.get('SCALES_PROFILE')
+ENABLED = bool(PROFILE_FILE)
+# Durations kept per timing for the percentiles.
+RESERVOIR_SIZE = 1024
+
+
+class Timing:
+    """The calls of one timing: their count, total and maximum and a uniform sample of their durations.
+
+    Durations are in nanoseconds. Once `RESERVOIR_SIZE` durations are kept, each new one
+    replaces a kept one at random with the odds that keep the sample uniform.
+    """
+    __slots__ = ('count', 'total', 'max', 'samples')
+    _random = random.Random(0)
+
+    def __init__(self):
+        self.count = self.total = self.max = 0
+        self.samples = []
+
+    def add(self, elapsed: int):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(elapsed)
+        else:
+            i = self._random.randrange(self.count)
+            if i < RESERVOIR_SIZE:
+                self.samples[i] = elapsed
+
+
+# Timings by name, and by name and key as 'name[key]'.
+_timings = defaultdict(Timing)
+
+
+def timed(name: str, key=None):
+    """Return a decorator timing every call under `name` when profiling is enabled.
+
+    `key`, called with the same arguments, labels each call, e.g. with its tonic, so the
+    timings are also kept per label under 'name[label]'.
+    """
+    def decorate(func):
+        if not ENABLED:
+            return func
+        timing = _timings[name]
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter_ns() - start
+                timing.add(elapsed)
+                if key is not None:
+                    _timings[f'{name}[{key(*args, **kwargs)}]'].add(elapsed)
+        return wrapper
+    return decorate
+
+
+def percentile(durations, fraction: float):
+    """Return the nearest-rank `fraction` percentile of the sorted `durations`."""
+    return durations[max(0, math.ceil(fraction * len(durations)) - 1)]
+
+
+def stats() -> dict[str, dict]:
+    """Return the count, total, mean, 50th, 90th and 99th percentile and maximum of every timing.
+
+    Times are in seconds, and the timings are ordered by total time, largest first. The
+    percentiles are those of the sampled durations, exact up to `RESERVOIR_SIZE` calls.
+    """
+    summary = {}
+    for name, timing in list(_timings.items()):
+        if not timing.count:
+            continue
+        durations = sorted(timing.samples)
+        summary[name] = {
+            'count': timing.count,
+            'total': timing.total / 1e9,
+            'mean': timing.total / timing.count / 1e9,
+            'p50': percentile(durations, 0.5) / 1e9,
+            'p90': percentile(durations, 0.9) / 1e9,
+            'p99': percentile(durations, 0.99) / 1e9,
+            'max': timing.max / 1e9,
+        }
+    return dict(sorted(summary.items(), key=lambda item: -item[1]['total']))
+
+
+def reset():
+    """Forget every timing recorded so far."""
+    for timing in _timings.values():
+        timing.__init__()
+
+
+def dump(path=PROFILE_FILE):
+    """Write `stats()` to `path` as JSON."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump({'pid': os.getpid(), 'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'timings': stats()},
+                  file, indent=2)
+
+
+def format_stats(timings, limit: int = None) -> str:
+    """Return `timings` as returned by `stats()` as a table, in microseconds."""
+    lines = [f'{"name":<50} {"count":>8} {"total ms":>10} {"mean":>9} {"p50":>9} {"p90":>9} {"p99":>9}']
+    for name, timing in list(timings.items())[:limit]:
+        lines.append(f'{name:<50} {timing["count"]:8} {timing["total"] * 1e3:10.2f}'
+                     + ''.join(f' {timing[field] * 1e6:9.2f}' for field in ('mean', 'p50', 'p90', 'p99')))
+    return '\n'.join(lines)
+
+
+if ENABLED:
+    atexit.register(dump)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1:
+        print('usage: python -m profiling FILE', file=sys.stderr)
+        return 2
+    with open(argv[0], encoding='utf-8') as file:
+        print(format_stats(json.load(file)['timings']))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
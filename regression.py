@@ -0,0 +1,77 @@
+"""Regression check: the scales of every tonic against the output of the original `keys.Scale`.
+
+scales_baseline.json holds what `scale_all()` of the first, hand-written `Scale` returned
+for every valid tonic. The registry, the lookup table and the 12-EDO path must keep that
+output byte for byte, so ``python -m regression`` compares `scale_all()`, every
+`Scale(tonic).<name>()` and `Scale(tonic, 12).<name>()` against it. It also checks
+that the step names of the finer resolutions in `EDOS` stay close to their 12-EDO
+pitch, prints each difference and exits with status 1 if there is any.
+"""
+import argparse
+import json
+import os
+import sys
+
+import keys
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scales_baseline.json')
+# The resolutions whose step names may carry at most `divisions // 24` '+' or '-' marks.
+EDOS = (24, 36, 53)
+
+
+def load_baseline(path=BASELINE_FILE) -> dict[str, dict[str, tuple[list[str], str]]]:
+    """Return the baseline stored at `path` as {tonic: {name: (scale, chords)}}."""
+    with open(path, encoding='utf-8') as file:
+        return {tonic: {name: (scale, chords) for name, (scale, chords) in scales.items()}
+                for tonic, scales in json.load(file).items()}
+
+
+def differences(baseline) -> list[str]:
+    """Return a line for every scale of `baseline` that the current `keys.Scale` returns differently."""
+    found = []
+    for tonic in keys.Scale.SHARP_TONES + keys.Scale.FLAT_TONES:
+        if tonic not in baseline:
+            try:
+                keys.Scale(tonic)
+            except ValueError:
+                continue
+            found.append(f'{tonic}: accepted, the baseline rejects it')
+            continue
+        expected = baseline[tonic]
+        scale = keys.Scale(tonic)
+        if list(scale.scale_all().items()) != list(expected.items()):
+            found.append(f'{tonic}: scale_all() differs')
+        for call, edo_scale in ((f'Scale({tonic!r})', scale), (f'Scale({tonic!r}, 12)', keys.Scale(tonic, 12))):
+            for name, result in expected.items():
+                method = getattr(edo_scale, name.lower(), None)
+                actual = None if method is None else method()
+                if actual != result:
+                    found.append(f'{call}.{name.lower()}(): {actual!r} != {result!r}')
+    return found
+
+
+def edo_differences(edos=EDOS) -> list[str]:
+    """Return a line for every step name of `edos` with more than `divisions // 24` marks."""
+    found = []
+    for divisions in edos:
+        for pitches in (keys.Scale.SHARP_PITCHES, keys.Scale.FLAT_PITCHES):
+            for name in keys.EDO.for_pitches(divisions, pitches).names:
+                if max(name.count('+'), name.count('-')) > divisions // 24:
+                    found.append(f'{divisions}-EDO: {name!r} has more than {divisions // 24} marks')
+    return found
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m regression',
+                                     description='Compare every scale of every tonic with the stored baseline.')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='baseline JSON file (default: %(default)s)')
+    args = parser.parse_args(argv)
+    found = differences(load_baseline(args.baseline)) + edo_differences()
+    for line in found:
+        print(line)
+    print(f'{len(found)} differences' if found else 'ok')
+    return 1 if found else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
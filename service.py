@@ -0,0 +1,230 @@
+"""HTTP/JSON service for the web front end and mobile apps.
+
+A small asyncio HTTP/1.1 server with keep-alive, using only the standard library.
+Every response body is deterministic for a given set of data files, so responses
+are serialized once, kept in an LRU cache and sent with a strong ETag; a request
+whose If-None-Match matches gets an empty 304. Scale, chord and fretboard
+responses are marked immutable; clients revalidate the index and song lists, since
+scales.json and the repertoire can change between restarts, and errors are not
+stored. Request bodies are not read: a request that may carry one is answered and
+its connection closed. Run ``python -m service --help`` for the options.
+
+Notes and chord roots are spelled one letter per degree, as in `spelling` and the
+fretboard sheets. Endpoints, with '#' in tonics written as %23:
+
+    GET /scales                                  tonics, scales and instruments
+    GET /scales/{tonic}/{scale}                  notes and chords
+    GET /chords/{tonic}/{scale}                  listed chords and the triad on every degree
+    GET /fretboard/{tonic}/{scale}/{instrument}  the fretboard sheet as text
+    GET /songs/{scale}                           song titles
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+from functools import lru_cache
+from typing import NamedTuple
+from urllib.parse import unquote, urlsplit
+
+import keys
+import snapshot
+import spelling
+
+HOST = '127.0.0.1'
+PORT = 8000
+RESPONSE_CACHE_SIZE = 4096
+MAX_HEADER_BYTES = 16 * 1024
+IMMUTABLE = 'public, max-age=31536000, immutable'
+REVALIDATE = 'public, no-cache'
+REASONS = {200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed'}
+
+
+class Response(NamedTuple):
+    """A serialized response: its status, ETag, Cache-Control value and JSON body."""
+    status: int
+    etag: str
+    cache_control: str
+    body: bytes
+
+
+class NotFound(Exception):
+    pass
+
+
+@lru_cache(maxsize=1)
+def views():
+    """Return the prebuilt snapshot if it is up to date, else the `sheets` module, on first use."""
+    return snapshot.views()
+
+
+@lru_cache(maxsize=1)
+def songs():
+    """Return the song source, opened on first use and shared by every request."""
+    from songdb import open_songs
+
+    return open_songs()
+
+
+def _scale(tonic: str, scale_name: str):
+    if scale_name.lower() not in keys.SCALES:
+        raise NotFound(f"unknown scale '{scale_name}'")
+    try:
+        return keys.TABLE.get(tonic, scale_name)
+    except ValueError:
+        raise NotFound(f"invalid tonic '{tonic}'") from None
+
+
+def _index(parts):
+    return {'tonics': list(keys.TABLE.tonics), 'scales': list(keys.SCALE_NAMES),
+            'instruments': list(views().instrument_names())}
+
+
+def _scales(parts):
+    tonic, scale_name = parts
+    _scale(tonic, scale_name)
+    notes, chords = spelling.spelled(tonic, scale_name)
+    return {'tonic': tonic, 'scale': keys.SCALES[scale_name.lower()].name, 'notes': list(notes), 'chords': chords}
+
+
+def _chords(parts):
+    import harmony
+
+    tonic, scale_name = parts
+    _scale(tonic, scale_name)
+    # Roots spelled as in `/scales`, one letter per degree.
+    pitches = spelling.pitch_names(tonic, scale_name, tuple(keys.Scale.for_tonic(tonic).pitches))
+    return {'tonic': tonic, 'scale': keys.SCALES[scale_name.lower()].name,
+            'chords': [chord.name(pitches) for chord in keys.Scale.for_tonic(tonic).chords(scale_name)],
+            'degrees': [None if chord is None else chord.name(pitches)
+                        for chord in harmony.harmonize(tonic, scale_name)]}
+
+
+def _fretboard(parts):
+    tonic, scale_name, instrument = parts
+    _scale(tonic, scale_name)
+    if instrument not in views().instrument_names():
+        raise NotFound(f"unknown instrument '{instrument}'")
+    name = keys.SCALES[scale_name.lower()].name
+    _, sheet = views().scale_view(tonic, name, instrument, songs())
+    return {'tonic': tonic, 'scale': name, 'instrument': instrument,
+            'tuning': list(views().tuning(instrument)), 'text': sheet}
+
+
+def _songs(parts):
+    scale_name, = parts
+    if scale_name.lower() not in keys.SCALES:
+        raise NotFound(f"unknown scale '{scale_name}'")
+    return {'scale': keys.SCALES[scale_name.lower()].name, 'songs': songs().by_scale(scale_name)}
+
+
+# Route name: {number of path parameters: (handler, Cache-Control)}. The index lists
+# scales.json, which can change without a code release, so clients revalidate it.
+ROUTES = {
+    'scales': {0: (_index, REVALIDATE), 2: (_scales, IMMUTABLE)},
+    'chords': {2: (_chords, IMMUTABLE)},
+    'fretboard': {3: (_fretboard, IMMUTABLE)},
+    'songs': {1: (_songs, REVALIDATE)},
+}
+
+
+def _serialize(status: int, payload, cache_control: str) -> Response:
+    body = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode()
+    return Response(status, '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"', cache_control, body)
+
+
+def respond(path: str) -> Response:
+    """Return the serialized response for the request `path`, built once per path without its query.
+
+    Only successful responses are cached, so requests for unknown paths cannot evict them.
+    """
+    try:
+        return _respond(urlsplit(path).path)
+    except NotFound as error:
+        return _serialize(404, {'error': str(error)}, 'no-store')
+
+
+@lru_cache(maxsize=RESPONSE_CACHE_SIZE)
+def _respond(path: str) -> Response:
+    # Raises NotFound instead of returning a 404, since `lru_cache` does not store exceptions.
+    name, *parts = [unquote(part) for part in path.strip('/').split('/')]
+    try:
+        handler, cache_control = ROUTES[name][len(parts)]
+    except KeyError:
+        raise NotFound(f"no route for '{path}'") from None
+    return _serialize(200, handler(parts), cache_control)
+
+
+def _head(status: int, headers, keep_alive: bool) -> bytes:
+    lines = [f'HTTP/1.1 {status} {REASONS[status]}', *headers,
+             'Connection: ' + ('keep-alive' if keep_alive else 'close')]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serve the requests of one connection until the client closes it or asks to."""
+    try:
+        while True:
+            try:
+                request = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                break
+            request_line, *header_lines = request.decode('latin-1').split('\r\n')
+            headers = {}
+            for line in header_lines:
+                field, _, value = line.partition(':')
+                headers[field.strip().lower()] = value.strip()
+            try:
+                method, path, version = request_line.split()
+            except ValueError:
+                writer.write(_head(400, ['Content-Length: 0'], False))
+                break
+            keep_alive = (headers.get('connection', '').lower() != 'close'
+                          if version == 'HTTP/1.1' else headers.get('connection', '').lower() == 'keep-alive')
+            # Request bodies are never read, so the connection closes after any request that
+            # may carry one; its bytes must not be parsed as the next request.
+            if (method not in ('GET', 'HEAD') or 'transfer-encoding' in headers
+                    or headers.get('content-length', '0').strip() not in ('', '0')):
+                keep_alive = False
+
+            if method not in ('GET', 'HEAD'):
+                writer.write(_head(405, ['Allow: GET, HEAD', 'Content-Length: 0'], keep_alive))
+            else:
+                response = respond(path)
+                cache_headers = [f'ETag: {response.etag}', f'Cache-Control: {response.cache_control}']
+                matches = {tag.strip() for tag in headers.get('if-none-match', '').split(',')}
+                if response.status == 200 and (response.etag in matches or '*' in matches):
+                    writer.write(_head(304, cache_headers, keep_alive))
+                else:
+                    writer.write(_head(response.status, ['Content-Type: application/json; charset=utf-8',
+                                                         f'Content-Length: {len(response.body)}', *cache_headers],
+                                       keep_alive))
+                    if method == 'GET':
+                        writer.write(response.body)
+            await writer.drain()
+            if not keep_alive:
+                break
+    finally:
+        writer.close()
+
+
+async def serve(host: str = HOST, port: int = PORT):
+    """Run the service on `host` and `port` until cancelled."""
+    server = await asyncio.start_server(handle, host, port, limit=MAX_HEADER_BYTES)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m service', description='Serve scales, chords and songs as JSON.')
+    parser.add_argument('--host', default=HOST, help=f'address to listen on (default: {HOST})')
+    parser.add_argument('-p', '--port', type=int, default=PORT, help=f'port to listen on (default: {PORT})')
+    args = parser.parse_args(argv)
+    print(f'serving on http://{args.host}:{args.port}')
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Plain-text views of scales: the text areas and fretboard sheet shown by `ScaleApp`.
+
+Everything here is pure and headless, so the GUI can render on a worker thread and
+the views can be benchmarked without a display. `snapshot.Snapshot` serves the same
+views from a prebuilt file.
+"""
+from functools import lru_cache
+
+import instruments
+from catalog import songs_text
+from keys import SCALE_NAMES, TABLE, TONICS, Scale
+from profiling import timed
+from spelling import pitch_names, spelled
+
+RULE = '-' * 54
+
+
+def key_tonics() -> tuple[str, ...]:
+    """Return the tonics of the key buttons, one per pitch class, 'A' first."""
+    return TONICS
+
+
+def scale_names() -> tuple[str, ...]:
+    """Return the display name of every scale, in registry order."""
+    return SCALE_NAMES
+
+
+def default_instrument() -> str:
+    """Return the key of the instrument shown at start-up."""
+    return instruments.DEFAULT_INSTRUMENT
+
+
+def instrument_names() -> dict[str, str]:
+    """Return the display name of every instrument by key."""
+    return {key: instrument.name for key, instrument in instruments.INSTRUMENTS.items()}
+
+
+def tuning(instrument: str) -> tuple[str, ...]:
+    """Return the open strings of `instrument`."""
+    return instruments.INSTRUMENTS[instrument].tuning
+
+
+def fretboard_text(instrument: str) -> str:
+    """Return the whole fretboard of `instrument` with every note shown."""
+    return instruments.fretboard(instrument).render()
+
+
+@lru_cache(maxsize=64)
+@timed('sheets.scales_text', key=lambda tonic: tonic)
+def scales_text(tonic: str) -> str:
+    """Return the notes and chords of every scale of `tonic`, as listed in the main text area.
+
+    Every degree is spelled on a letter of its own, see `spelling`.
+    """
+    texts = []
+    for name in TABLE.scales(tonic):
+        scale, chords = spelled(tonic, name)
+        texts.append(f'{tonic} {name} Scale: {" ".join(scale)}\n{name} Chords: {chords}')
+    return '\n\n'.join(texts) + '\n'
+
+
+def scale_info(tonic: str, scale_name: str) -> str:
+    """Return the key, name, notes and chords of a scale as shown above the fretboard."""
+    scale, chords = spelled(tonic, scale_name)
+    return (f'{RULE}\n'
+            f'Selected Key: {tonic}\n'
+            f'Scale Name: {scale_name}\n'
+            f'Scale: {list(scale)}\n'
+            f'Chords: {chords}\n'
+            f'{RULE}\n')
+
+
+def scale_sheet(tonic: str, scale_name: str, board) -> str:
+    """Return the scale information followed by `board` with the notes outside the scale blanked.
+
+    The notes of the scale are spelled on the board as in the information above it.
+    """
+    return (scale_info(tonic, scale_name) + '\n'
+            + board.render(Scale.for_tonic(tonic).mask(scale_name), pitch_names(tonic, scale_name, board.pitches)))
+
+
+@lru_cache(maxsize=512)
+@timed('sheets.scale_view', key=lambda tonic, scale_name, instrument, songs: f'{tonic} {scale_name} {instrument}')
+def scale_view(tonic: str, scale_name: str, instrument: str, songs) -> tuple[str, str]:
+    """Return the songs pane text and the fretboard sheet of a scale on `instrument`.
+
+    `songs` is the song source (`catalog.SongCatalog` or `songdb.SongDatabase`) to list from.
+    """
+    return (songs_text(scale_name, songs.by_scale(scale_name)),
+            scale_sheet(tonic, scale_name, instruments.fretboard(instrument)))
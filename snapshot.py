@@ -0,0 +1,230 @@
+"""Prebuilt snapshot of every view, for a start-up that computes nothing.
+
+``python -m snapshot build`` renders every scale of every tonic and the fretboard
+sheets of every instrument into scales.snap. Songs are not part of it: they are
+listed from the song source in use, which may be a songs.db built since. The file
+starts with a fixed header holding a hash of the data files and modules the views
+are made from, and the offset of a JSON index of the blobs that follow. Loading is an mmap,
+a hash of those sources and one index read. Neither NumPy nor `keys` is imported,
+so no scale is computed: the tonics and scale names come from the snapshot too. A
+snapshot built from other sources than the live ones is ignored.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+
+from catalog import songs_text
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SNAPSHOT_FILE = os.path.join(HERE, 'scales.snap')
+MAGIC = b'SCALSNAP'
+VERSION = 3
+# Magic, format version, source hash, index offset and index length.
+HEADER = struct.Struct('<8sI32sQQ')
+# Every file whose contents can change a view, including this one for the format.
+SOURCES = ('scales.json', 'keys.py', 'spelling.py', 'fretboard.py', 'instruments.py', 'sheets.py', 'snapshot.py')
+
+
+def source_hash(directory=HERE) -> bytes:
+    """Return the SHA-256 of the `SOURCES` in `directory`."""
+    digest = hashlib.sha256()
+    for name in SOURCES:
+        with open(os.path.join(directory, name), 'rb') as file:
+            data = file.read()
+        digest.update(f'{name}:{len(data)}:'.encode())
+        digest.update(data)
+    return digest.digest()
+
+
+def build(path=SNAPSHOT_FILE) -> int:
+    """Render every view into a new snapshot at `path`, returning its size in bytes."""
+    import instruments
+    import sheets
+    import spelling
+    from keys import SCALE_NAMES, TABLE, TONICS
+
+    blobs = {'meta': json.dumps({
+        'tonics': TABLE.tonics,
+        'key_tonics': TONICS,
+        'scales': {name.lower(): name for name in SCALE_NAMES},
+        'default_instrument': instruments.DEFAULT_INSTRUMENT,
+        'instruments': {key: {'name': instrument.name, 'tuning': instrument.tuning}
+                        for key, instrument in instruments.INSTRUMENTS.items()},
+    })}
+    for tonic in TABLE.tonics:
+        blobs[f'scales/{tonic}'] = json.dumps(spelling.scales(tonic))
+        blobs[f'scales_text/{tonic}'] = sheets.scales_text(tonic)
+    for instrument in instruments.INSTRUMENTS:
+        board = instruments.fretboard(instrument)
+        blobs[f'fretboard/{instrument}'] = board.render()
+        for tonic in TABLE.tonics:
+            for name in SCALE_NAMES:
+                blobs[f'sheet/{instrument}/{tonic}/{name}'] = sheets.scale_sheet(tonic, name, board)
+
+    index = {}
+    body = bytearray()
+    for key, text in blobs.items():
+        data = text.encode()
+        index[key] = (HEADER.size + len(body), len(data))
+        body += data
+    index_data = json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode()
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, source_hash(), HEADER.size + len(body), len(index_data)))
+        file.write(body)
+        file.write(index_data)
+    os.replace(tmp_path, path)
+    return HEADER.size + len(body) + len(index_data)
+
+
+class Snapshot:
+    """A read-only, memory-mapped snapshot with the views of `sheets`.
+
+    Parameters:
+    ----------
+    path:
+        The snapshot file, defaults to `SNAPSHOT_FILE`.
+
+    Raises:
+    ------
+    ValueError:
+        If the file is not a snapshot of this format or was built from other sources.
+
+    Functions:
+    ---------
+    key_tonics() -> tuple[str, ...]:
+        Return the tonics of the key buttons, like `keys.TONICS`.
+    scale_names() -> tuple[str, ...]:
+        Return the display name of every scale, like `keys.SCALE_NAMES`.
+    scales(tonic: str) -> dict[str, tuple[tuple[str, ...], str]]:
+        Return the {name: (scale, chords)} mapping for `tonic`, like `spelling.scales`.
+    default_instrument() -> str:
+        Return the key of the instrument shown at start-up.
+    instrument_names() -> dict[str, str]:
+        Return the display name of every instrument by key.
+    tuning(instrument: str) -> tuple[str, ...]:
+        Return the open strings of `instrument`.
+    fretboard_text(instrument: str) -> str:
+        Return the whole fretboard of `instrument`.
+    scales_text(tonic: str) -> str:
+        Return the notes and chords of every scale of `tonic`.
+    scale_view(tonic: str, scale_name: str, instrument: str, songs) -> tuple[str, str]:
+        Return the songs pane text and the fretboard sheet of a scale on `instrument`.
+    """
+
+    def __init__(self, path=SNAPSHOT_FILE):
+        self.path = path
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, digest, index_offset, index_length = HEADER.unpack_from(self._map)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"'{path}' is not a version {VERSION} snapshot.")
+            if digest != source_hash():
+                raise ValueError(f"'{path}' was built from other sources, "
+                                 "rebuild it with 'python -m snapshot build'.")
+            self._index = json.loads(self._map[index_offset:index_offset + index_length])
+        except (ValueError, struct.error):
+            self._map.close()
+            raise
+        self._meta = json.loads(self._text('meta'))
+        self.tonics = tuple(self._meta['tonics'])
+
+    def close(self):
+        self._map.close()
+
+    def _text(self, key: str) -> str:
+        offset, length = self._index[key]
+        return self._map[offset:offset + length].decode()
+
+    def key_tonics(self) -> tuple[str, ...]:
+        """Return the tonics of the key buttons, one per pitch class, 'A' first."""
+        return tuple(self._meta['key_tonics'])
+
+    def scale_names(self) -> tuple[str, ...]:
+        """Return the display name of every scale, in registry order."""
+        return tuple(self._meta['scales'].values())
+
+    def scales(self, tonic: str) -> dict:
+        """Return the {name: (scale, chords)} mapping for `tonic`, like `spelling.scales`."""
+        try:
+            scales = json.loads(self._text(f'scales/{tonic}'))
+        except KeyError:
+            raise ValueError("Invalid tonic value provided for `Scale` object.") from None
+        return {name: (tuple(notes), chords) for name, (notes, chords) in scales.items()}
+
+    def default_instrument(self) -> str:
+        """Return the key of the instrument shown at start-up."""
+        return self._meta['default_instrument']
+
+    def instrument_names(self) -> dict[str, str]:
+        """Return the display name of every instrument by key."""
+        return {key: instrument['name'] for key, instrument in self._meta['instruments'].items()}
+
+    def tuning(self, instrument: str) -> tuple[str, ...]:
+        """Return the open strings of `instrument`."""
+        return tuple(self._meta['instruments'][instrument]['tuning'])
+
+    def fretboard_text(self, instrument: str) -> str:
+        """Return the whole fretboard of `instrument` with every note shown."""
+        return self._text(f'fretboard/{instrument}')
+
+    def scales_text(self, tonic: str) -> str:
+        """Return the notes and chords of every scale of `tonic`, as listed in the main text area."""
+        return self._text(f'scales_text/{tonic}')
+
+    def scale_view(self, tonic: str, scale_name: str, instrument: str, songs) -> tuple[str, str]:
+        """Return the songs pane text and the fretboard sheet of a scale on `instrument`.
+
+        `songs` is the song source to list from, as for `sheets.scale_view`. Instruments
+        outside the snapshot are rendered by `sheets`.
+        """
+        name = self._meta['scales'][scale_name.lower()]
+        try:
+            sheet = self._text(f'sheet/{instrument}/{tonic}/{name}')
+        except KeyError:
+            import sheets
+            return sheets.scale_view(tonic, scale_name, instrument, songs)
+        return songs_text(name, songs.by_scale(name)), sheet
+
+
+def load(path=SNAPSHOT_FILE):
+    """Return the `Snapshot` at `path`, or None if there is none or it is stale."""
+    try:
+        return Snapshot(path)
+    except (OSError, ValueError):
+        return None
+
+
+def views(path=SNAPSHOT_FILE):
+    """Return the valid snapshot at `path` if there is one, else the `sheets` module computing the views."""
+    snapshot = load(path)
+    if snapshot is None:
+        import sheets
+        return sheets
+    return snapshot
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (1, 2) or argv[0] not in ('build', 'check'):
+        print('usage: python -m snapshot build|check [SNAPSHOT]', file=sys.stderr)
+        return 2
+    path = argv[1] if len(argv) > 1 else SNAPSHOT_FILE
+    if argv[0] == 'build':
+        print(f'wrote {path} ({build(path) / 1e6:.1f} MB)')
+        return 0
+    try:
+        Snapshot(path).close()
+    except (OSError, ValueError) as error:
+        print(error, file=sys.stderr)
+        return 1
+    print(f'{path} is up to date')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
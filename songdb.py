@@ -0,0 +1,159 @@
+"""Read-only SQLite store for large repertoires.
+
+``python -m songdb build`` converts songs.json into songs.db. Readers open the file
+read-only with SQLite's memory-mapped I/O, so they fetch only the rows they query
+and every process shares the same pages from the OS cache instead of holding its
+own copy of the repertoire.
+"""
+import json
+import os
+import sys
+
+from catalog import CATALOG, SONGS_FILE, normalize_scale
+from profiling import timed
+
+DB_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'songs.db')
+MMAP_SIZE = 256 * 1024 * 1024
+# Stored in the file's user_version; a database built with an older schema is ignored until rebuilt.
+SCHEMA_VERSION = 2
+
+SCHEMA = '''
+CREATE TABLE songs (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    tonic TEXT,
+    metadata TEXT
+);
+CREATE TABLE song_scales (
+    scale TEXT NOT NULL,
+    song_id INTEGER NOT NULL REFERENCES songs(id),
+    position INTEGER NOT NULL,
+    place INTEGER,
+    PRIMARY KEY (scale, song_id)
+) WITHOUT ROWID;
+CREATE INDEX songs_title ON songs(title COLLATE NOCASE);
+CREATE INDEX songs_tonic ON songs(tonic);
+CREATE INDEX song_scales_song ON song_scales(song_id);
+'''
+
+
+def build(entries, path=DB_FILE):
+    """Write the song `entries` (dicts as in songs.json) to a new database at `path`.
+
+    `position` is the scale's index among the song's scales and `place` the song's
+    place among the songs of the scale, from the entry's 'order'. Keys other than
+    'title', 'scales', 'order' and 'tonic' are kept as JSON metadata.
+    """
+    import sqlite3
+
+    tmp_path = path + '.tmp'
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    connection = sqlite3.connect(tmp_path)
+    try:
+        connection.executescript(SCHEMA)
+        connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        for i, entry in enumerate(entries):
+            metadata = {key: value for key, value in entry.items() if key not in ('title', 'scales', 'order', 'tonic')}
+            connection.execute('INSERT INTO songs VALUES (?, ?, ?, ?)',
+                               (i, entry['title'], entry.get('tonic'), json.dumps(metadata) if metadata else None))
+            scales = entry['scales']
+            places = list(entry.get('order', []))[:len(scales)]
+            places += [None] * (len(scales) - len(places))
+            connection.executemany('INSERT OR IGNORE INTO song_scales VALUES (?, ?, ?, ?)',
+                                   ((normalize_scale(scale), i, position, place)
+                                    for position, (scale, place) in enumerate(zip(scales, places))))
+        connection.commit()
+        connection.execute('VACUUM')
+    finally:
+        connection.close()
+    os.replace(tmp_path, path)
+
+
+class SongDatabase:
+    """A read-only view of a songs.db file with the lookups of `catalog.SongCatalog`.
+
+    Parameters:
+    ----------
+    path:
+        The database file, defaults to `DB_FILE`.
+
+    Functions:
+    ---------
+    by_scale(scale: str) -> list[str]:
+        Return the titles played in `scale`, in their order for that scale.
+    scales_of(title: str) -> tuple[str, ...]:
+        Return the scales of the song called `title`.
+    by_tonic(tonic: str) -> list[str]:
+        Return the titles played in `tonic`, in catalog order.
+    metadata(title: str) -> dict:
+        Return the extra fields stored for the song called `title`.
+    """
+
+    def __init__(self, path=DB_FILE):
+        import sqlite3
+
+        self.path = path
+        # Read-only and shared with worker threads; SQLite serializes the access itself.
+        self._connection = sqlite3.connect(f'file:{path}?mode=ro', uri=True, check_same_thread=False)
+        self._connection.execute(f'PRAGMA mmap_size = {MMAP_SIZE}')
+
+    def close(self):
+        self._connection.close()
+
+    def schema_version(self) -> int:
+        """Return the `SCHEMA_VERSION` the database was built with, 0 for the first schema."""
+        return self._connection.execute('PRAGMA user_version').fetchone()[0]
+
+    @timed('SongDatabase.by_scale', key=lambda self, scale: scale)
+    def by_scale(self, scale: str) -> list[str]:
+        """Return the titles played in `scale`, in their 'order' for that scale, then in catalog order."""
+        rows = self._connection.execute(
+            'SELECT title FROM song_scales JOIN songs ON songs.id = song_id WHERE scale = ? '
+            'ORDER BY place IS NULL, place, song_id', (normalize_scale(scale),))
+        return [title for title, in rows]
+
+    def scales_of(self, title: str) -> tuple[str, ...]:
+        """Return the scales of the song called `title`, or an empty tuple if there is none."""
+        rows = self._connection.execute(
+            'SELECT scale FROM song_scales WHERE song_id = '
+            '(SELECT id FROM songs WHERE title = ? COLLATE NOCASE ORDER BY id LIMIT 1) ORDER BY position', (title,))
+        return tuple(scale for scale, in rows)
+
+    def by_tonic(self, tonic: str) -> list[str]:
+        """Return the titles played in `tonic`, in catalog order."""
+        rows = self._connection.execute('SELECT title FROM songs WHERE tonic = ? ORDER BY id', (tonic,))
+        return [title for title, in rows]
+
+    def metadata(self, title: str) -> dict:
+        """Return the extra fields stored for the song called `title`."""
+        row = self._connection.execute(
+            'SELECT metadata FROM songs WHERE title = ? COLLATE NOCASE ORDER BY id LIMIT 1', (title,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else {}
+
+
+def open_songs(path=DB_FILE, source=SONGS_FILE):
+    """Return a `SongDatabase` if `path` was built after `source` changed, else the JSON catalog."""
+    if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source):
+        database = SongDatabase(path)
+        if database.schema_version() == SCHEMA_VERSION:
+            return database
+        database.close()
+    return CATALOG
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) not in (1, 2, 3) or argv[0] != 'build':
+        print('usage: python -m songdb build [SONGS_JSON [SONGS_DB]]', file=sys.stderr)
+        return 2
+    source = argv[1] if len(argv) > 1 else SONGS_FILE
+    path = argv[2] if len(argv) > 2 else DB_FILE
+    with open(source, encoding='utf-8') as file:
+        build(json.load(file), path)
+    print(f'wrote {path}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
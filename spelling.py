@@ -0,0 +1,87 @@
+"""Enharmonic spelling: every degree of a scale on a letter of its own.
+
+`keys.Scale` spells a whole scale from one chromatic scale, with sharps or with flats
+depending on the tonic, so dromoi with an augmented second repeat a letter, e.g.
+D D# F# G A A# C D for Xitzaz. Here the degrees of a seven-note scale take the seven
+letters in turn from the tonic, each with the accidental that makes up its pitch:
+D Eb F# G A Bb C D. Spellings are computed once per interval pattern and tonic, so
+every later lookup, and every scale sharing a pattern such as Major and Rast, is a
+table lookup. Scales of other sizes keep the spelling of `keys.Scale`.
+"""
+from functools import lru_cache
+
+import keys
+from keys import ACCIDENTALS, NATURALS
+
+LETTERS = 'ABCDEFG'
+
+
+def _fallback(tonic: str):
+    # The chromatic scale `keys.Scale` spells the scales of `tonic` from.
+    return keys.Scale.SHARP_PITCHES if tonic in keys.Scale.SHARP_TONES else keys.Scale.FLAT_PITCHES
+
+
+@lru_cache(maxsize=None)
+def spell_pattern(intervals: str, tonic: str) -> tuple[str, ...]:
+    """Return the notes of the interval pattern `intervals` up from `tonic`, one letter per degree.
+
+    The tonic keeps its own spelling and the octave repeats it. A degree that is more
+    than a double sharp or flat away from its letter keeps the spelling of `keys.Scale`.
+
+    Raises:
+    ------
+    ValueError:
+        If `tonic` is not a known note name.
+    """
+    root = keys.pitch_class(tonic)
+    # Minor tonics such as 'c' and 'd' are flat keys while 'C' and 'D' are sharp ones.
+    pitches = _fallback(tonic)
+    tonic = tonic.capitalize()
+    offsets = [0]
+    for interval in intervals:
+        offsets.append(offsets[-1] + keys.Scale.INTERVALS[interval])
+    if len(intervals) != len(LETTERS):
+        return tuple(pitches[(root + offset) % 12] for offset in offsets)
+
+    start = LETTERS.index(tonic[0])
+    notes = [tonic]
+    for degree, offset in enumerate(offsets[1:-1], 1):
+        letter = LETTERS[(start + degree) % 7]
+        pitch = (root + offset) % 12
+        accidental = ACCIDENTALS.get((pitch - NATURALS[letter] + 6) % 12 - 6)
+        notes.append(pitches[pitch] if accidental is None else letter + accidental)
+    notes.append(tonic)
+    return tuple(notes)
+
+
+@lru_cache(maxsize=None)
+def spelled(tonic: str, scale_name: str) -> tuple[tuple[str, ...], str]:
+    """Return the notes of the scale `scale_name` on `tonic`, one letter per degree, and its chords."""
+    definition = keys.SCALES[scale_name.lower()]
+    notes = spell_pattern(definition.intervals, tonic)
+    return notes, definition.chord_format.format(*notes)
+
+
+def scales(tonic: str) -> dict[str, tuple[tuple[str, ...], str]]:
+    """Return every registered scale on `tonic` as {name: (notes, chords)}, spelled as in `spelled`.
+
+    Raises:
+    ------
+    ValueError:
+        If `tonic` is not a valid tonic of `keys.Scale`.
+    """
+    return {name: spelled(tonic, name) for name in keys.TABLE.scales(tonic)}
+
+
+@lru_cache(maxsize=1024)
+def pitch_names(tonic: str, scale_name: str, pitches: tuple[str, ...]) -> tuple[str, ...]:
+    """Return the 12 note names, 'A' first, with the scale `scale_name` on `tonic` spelled as in `spelled`.
+
+    Pitch classes outside the scale keep their name in `pitches`.
+    """
+    names = list(pitches)
+    root = keys.pitch_class(tonic)
+    notes, _ = spelled(tonic, scale_name)
+    for offset, note in zip(keys.SCALES[scale_name.lower()].offsets, notes):
+        names[(root + offset) % 12] = note
+    return tuple(names)